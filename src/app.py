@@ -1,13 +1,18 @@
 import streamlit as st
 import pandas as pd
-import joblib
-from weather_api import get_weather_data
+from weather_api import get_weather_data, MONITORED_CITIES
+from model_registry import get_bundle
+from preprocessing_script import transform_features
+from risk_map import lookup_risk
+from spatial_index import get_index
 
 # ----------------- Load model -----------------
-model_bundle = joblib.load("flood_model.pkl")
+# Current model of the artifact store, cached per process by the registry so widget reruns don't reload it
+model_bundle = get_bundle()
 model = model_bundle["model"]
 scaler = model_bundle["scaler"]
 encoders = model_bundle["encoders"]
+features = model_bundle.get("features")
 
 # ----------------- Page config -----------------
 st.set_page_config(page_title="Flood Prediction AI", layout="wide")
@@ -309,12 +314,7 @@ elif mode == "Fetch Live Weather":
             </div>
         """, unsafe_allow_html=True)
         
-        indian_cities = [
-            "Mumbai", "Delhi", "Kolkata", "Chennai", "Bengaluru", 
-            "Hyderabad", "Pune", "Ahmedabad", "Jaipur", "Lucknow",
-            "Patna", "Bhopal", "Guwahati", "Thiruvananthapuram", "Kochi",
-            "Varanasi", "Nagpur", "Surat", "Ranchi", "Chandigarh"
-        ]
+        indian_cities = MONITORED_CITIES
 
         city = st.selectbox("Select a City (India)", indian_cities, help="Choose a city to fetch live weather data")
 
@@ -354,6 +354,20 @@ if st.session_state.weather_data and mode == "Fetch Live Weather":
     temperature = weather.get("temp_c", 25.0)
     humidity = weather.get("humidity", 70.0)
     rainfall = weather.get("rainfall", 0.0)
+    latitude = weather.get("lat") or latitude
+    longitude = weather.get("lon") or longitude
+
+# ----------------- Static features from the nearest known location -----------------
+# Replaces the hard-coded defaults when spatial_index.joblib has been built (spatial_index.py build)
+spatial_index = get_index()
+if spatial_index is not None and (latitude or longitude):
+    static = spatial_index.query(latitude, longitude)
+    land_cover, soil_type = static["Land Cover"], static["Soil Type"]
+    population_density, infrastructure = static["Population Density"], static["Infrastructure"]
+    historical_floods = static["Historical Floods"]
+    # Manual mode keeps the elevation the user typed
+    if mode == "Fetch Live Weather":
+        elevation = static["Elevation"]
 
 input_df = pd.DataFrame([[latitude, longitude, rainfall, temperature, humidity,
     river_discharge, water_level, elevation, land_cover, soil_type,
@@ -362,7 +376,8 @@ input_df = pd.DataFrame([[latitude, longitude, rainfall, temperature, humidity,
     "River Discharge","Water Level","Elevation","Land Cover","Soil Type",
     "Population Density","Infrastructure","Historical Floods"])
 
-X_scaled = scaler.transform(input_df)
+# Same encoding + feature engineering + scaling as training
+X_scaled = transform_features(input_df, scaler, encoders, features=features)
 
 # ----------------- Layout -----------------
 col1, col2 = st.columns(2)
@@ -408,8 +423,19 @@ with col2:
     """, unsafe_allow_html=True)
     
     if st.button("Analyze Flood Risk", type="primary"):
-        prediction = model.predict(X_scaled)[0]
-        probability = model.predict_proba(X_scaled)[0]
+        # Live weather mode reads the precomputed risk map (risk_map.py) when one covers this city
+        precomputed = None
+        if mode == "Fetch Live Weather" and st.session_state.weather_data:
+            weather = st.session_state.weather_data
+            precomputed = lookup_risk(weather.get("lat"), weather.get("lon"))
+
+        if precomputed is not None:
+            prediction = precomputed["prediction"]
+            probability = [1 - precomputed["probability"], precomputed["probability"]]
+            st.caption(f"Precomputed risk map, updated {precomputed['updated_at']}")
+        else:
+            prediction = model.predict(X_scaled)[0]
+            probability = model.predict_proba(X_scaled)[0]
 
         if prediction == 1:
             risk_level = "HIGH RISK"
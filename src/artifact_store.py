@@ -0,0 +1,199 @@
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import re
+
+import joblib
+
+# Versioned model artifacts instead of loose *_model.pkl files:
+#   artifacts/<name>/v0001/bundle.joblib   save_model bundle, uncompressed so joblib.load(mmap_mode="r")
+#                                          maps its NumPy arrays instead of reading them into memory
+#   artifacts/<name>/v0001/manifest.json   content hash, file sizes and the run's metrics from the training log
+#   artifacts/<name>/current               version served for that model
+#   artifacts/current                      "<name>/<version>" served by default (app, predict, serve, risk_map)
+# Memory-mapped arrays are shared between scoring processes through the page cache. SVMs get writable
+# copies of their arrays (libsvm's predict_proba needs them), and objects that copy their arrays on
+# unpickle (sklearn trees, the XGBoost booster) get a private copy each, see model_registry.load_bundle.
+STORE_DIR = "artifacts"
+BUNDLE_FILE = "bundle.joblib"
+MANIFEST_FILE = "manifest.json"
+
+
+def slug(model_name):
+    return re.sub(r"[^A-Za-z0-9]+", "_", model_name).strip("_")
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _write_atomic(path, text):
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "w") as fh:
+        fh.write(text)
+    os.replace(tmp, path)
+
+
+def _read(path):
+    with open(path) as fh:
+        return fh.read().strip()
+
+
+def _new_version_dir(model_dir):
+    # makedirs without exist_ok claims the version atomically, so concurrent publishes can't collide
+    os.makedirs(model_dir, exist_ok=True)
+    existing = [int(d[1:]) for d in os.listdir(model_dir) if re.fullmatch(r"v\d+", d)]
+    n = max(existing, default=0) + 1
+    while True:
+        path = os.path.join(model_dir, f"v{n:04d}")
+        try:
+            os.makedirs(path)
+            return path
+        except FileExistsError:
+            n += 1
+
+
+def publish(model, scaler, label_encoders, model_name, features=None, store=STORE_DIR, make_current=True):
+    version_dir = _new_version_dir(os.path.join(store, slug(model_name)))
+    bundle_path = os.path.join(version_dir, BUNDLE_FILE)
+    package = {"model": model, "scaler": scaler, "encoders": label_encoders, "features": features}
+    joblib.dump(package, bundle_path, compress=0)
+
+    manifest = {
+        "name": model_name,
+        "version": os.path.basename(version_dir),
+        "created_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "model_type": type(getattr(model, "steps", [[None, model]])[-1][1]).__name__,
+        "sha256": _sha256(bundle_path),
+        "files": {BUNDLE_FILE: os.path.getsize(bundle_path)},
+        "run": None,
+    }
+    _write_atomic(os.path.join(version_dir, MANIFEST_FILE), json.dumps(manifest, indent=2))
+    if make_current:
+        set_current(model_name, manifest["version"], store, default=False)
+    print(f"Published {model_name} {manifest['version']} to {version_dir}")
+    return version_dir
+
+
+def import_bundle(path, model_name=None, store=STORE_DIR):
+    # Publishes a loose bundle written by save_model, e.g. "XGBoost_(Tuned)_model.pkl" -> "XGBoost (Tuned)"
+    bundle = joblib.load(path)
+    model_name = model_name or os.path.basename(path).rsplit("_model.", 1)[0].replace("_", " ")
+    return publish(bundle["model"], bundle["scaler"], bundle["encoders"], model_name,
+                   features=bundle.get("features"), store=store)
+
+
+def record_run(version_dir, run_id, log_file="training_logs.csv"):
+    # Copies the training-log row of this run (accuracy, macro scores, stage metrics...) into the manifest,
+    # and lists files added next to the bundle since publish (e.g. the compiled .npz)
+    from logs import query_runs
+    runs = query_runs(log_file, run_id=run_id)
+    manifest = read_manifest(version_dir)
+    manifest["run"] = runs[0] if runs else {"run_id": run_id}
+    manifest["files"] = {f: os.path.getsize(os.path.join(version_dir, f)) for f in sorted(os.listdir(version_dir))
+                         if not f.startswith(MANIFEST_FILE)}
+    _write_atomic(os.path.join(version_dir, MANIFEST_FILE), json.dumps(manifest, indent=2, default=str))
+    return manifest
+
+
+def read_manifest(version_dir):
+    with open(os.path.join(version_dir, MANIFEST_FILE)) as fh:
+        return json.load(fh)
+
+
+def verify(version_dir):
+    manifest = read_manifest(version_dir)
+    return _sha256(os.path.join(version_dir, BUNDLE_FILE)) == manifest["sha256"]
+
+
+def set_current(model_name, version=None, store=STORE_DIR, default=True):
+    # Points <name>/current (and with default=True the store-wide current) at a version, latest if None
+    model_dir = os.path.join(store, slug(model_name))
+    version = version or versions(model_name, store)[-1]
+    if not os.path.exists(os.path.join(model_dir, version, BUNDLE_FILE)):
+        raise FileNotFoundError(f"No bundle for {model_name} {version} in {store}")
+    _write_atomic(os.path.join(model_dir, "current"), version)
+    if default:
+        _write_atomic(os.path.join(store, "current"), f"{slug(model_name)}/{version}")
+    return version
+
+
+def versions(model_name, store=STORE_DIR):
+    model_dir = os.path.join(store, slug(model_name))
+    if not os.path.isdir(model_dir):
+        return []
+    return sorted(d for d in os.listdir(model_dir) if re.fullmatch(r"v\d+", d))
+
+
+def models(store=STORE_DIR):
+    if not os.path.isdir(store):
+        return []
+    return sorted(d for d in os.listdir(store) if os.path.isdir(os.path.join(store, d)))
+
+
+def resolve(model_name=None, version=None, store=STORE_DIR):
+    # Path of the bundle for a model / version; defaults to the current pointers
+    if model_name is None:
+        pointer = os.path.join(store, "current")
+        if not os.path.exists(pointer):
+            raise FileNotFoundError(f"No current model in {store}, train one with main.py or run "
+                                    f"'python src/artifact_store.py promote <name>'")
+        model_name, version = _read(pointer).split("/")
+    model_dir = os.path.join(store, slug(model_name))
+    if version is None:
+        version = _read(os.path.join(model_dir, "current"))
+    return os.path.join(model_dir, version, BUNDLE_FILE)
+
+
+def locate(name_or_path):
+    # CLI helper: an existing file is used as is, anything else is looked up as a model name in the store
+    return name_or_path if os.path.isfile(name_or_path) else resolve(name_or_path)
+
+
+def load(model_name=None, version=None, store=STORE_DIR, mmap_mode="r"):
+    from model_registry import load_bundle
+    return load_bundle(resolve(model_name, version, store), mmap_mode=mmap_mode)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and promote versioned model artifacts.")
+    parser.add_argument("command", choices=["list", "promote", "verify", "path", "import"])
+    parser.add_argument("name", nargs="?", default=None, help="Model name (bundle path for import)")
+    parser.add_argument("--as-name", default=None, help="Model name for import (default: from the file name)")
+    parser.add_argument("--version", default=None)
+    parser.add_argument("--store", default=STORE_DIR)
+    args = parser.parse_args()
+    if args.command in ("promote", "import") and args.name is None:
+        parser.error(f"{args.command} needs a {'bundle path' if args.command == 'import' else 'model name'}")
+
+    if args.command == "import":
+        import_bundle(args.name, args.as_name, args.store)
+    elif args.command == "path":
+        print(resolve(args.name, args.version, args.store))
+    elif args.command == "promote":
+        version = set_current(args.name, args.version, args.store)
+        print(f"Current model: {slug(args.name)}/{version}")
+    elif args.command == "verify":
+        # Without a name, the store-wide current model
+        version_dir = os.path.dirname(resolve(args.name, args.version, args.store))
+        ok = verify(version_dir)
+        print(f"{os.path.relpath(version_dir, args.store)}: {'ok' if ok else 'HASH MISMATCH'}")
+    else:
+        current = _read(os.path.join(args.store, "current")) if os.path.exists(os.path.join(args.store, "current")) else None
+        for name in models(args.store):
+            for version in versions(name, args.store):
+                manifest = read_manifest(os.path.join(args.store, name, version))
+                run = manifest.get("run") or {}
+                marker = "*" if current == f"{name}/{version}" else " "
+                acc = f"acc={run['accuracy']:.4f}" if run.get("accuracy") is not None else ""
+                print(f"{marker} {name}/{version}  {manifest['created_at']}  {manifest['sha256'][:12]}  {acc}")
+
+
+if __name__ == "__main__":
+    main()
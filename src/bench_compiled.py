@@ -0,0 +1,82 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from export_model import export_compiled_model
+from compiled_model import load_compiled_model
+from artifact_store import locate
+from preprocessing_script import transform_features
+
+
+def time_call(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def import_seconds(stmt):
+    # None when the import fails, e.g. xgboost or imblearn not installed
+    try:
+        out = subprocess.run([sys.executable, "-c", f"import time; t = time.perf_counter(); {stmt}; print(time.perf_counter() - t)"],
+                             capture_output=True, text=True, check=True, cwd=sys.path[0])
+    except subprocess.CalledProcessError:
+        return None
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _format_import(seconds):
+    return "unavailable" if seconds is None else f"{seconds:.3f}s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check parity and speed of the compiled model against the pickled pipeline.")
+    parser.add_argument("--model", default="XGBoost (Tuned)", help="Bundle path or artifact store model name")
+    parser.add_argument("--data", default="data/flood_risk_dataset_india.csv")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--tolerance", type=float, default=1e-2, help="Max allowed probability difference")
+    args = parser.parse_args()
+    args.model = locate(args.model)
+
+    bundle = joblib.load(args.model)
+    model, scaler, encoders = bundle["model"], bundle["scaler"], bundle["encoders"]
+    features = bundle.get("features")
+    with tempfile.TemporaryDirectory(prefix="bench_compiled_") as tmp:
+        compiled_file = os.path.join(tmp, "model.npz")
+        export_compiled_model(model, scaler, encoders, compiled_file, features=features)
+        compiled = load_compiled_model(compiled_file)
+
+    df = pd.read_csv(args.data, nrows=args.rows).dropna().drop(columns=["Flood Occurred"])
+    expected = model.predict_proba(transform_features(df, scaler, encoders, features=features))
+    actual = compiled.predict_proba(df)
+    max_diff = float(np.abs(expected - actual).max())
+    agree = float((expected.argmax(axis=1) == actual.argmax(axis=1)).mean())
+    print(f"Parity: max |p_pipeline - p_compiled| = {max_diff:.2e}, label agreement = {agree:.4%}")
+    # Probabilities within the tolerance and every predicted label identical, otherwise the timings are meaningless
+    if max_diff > args.tolerance or agree < 1.0:
+        print(f"Parity check failed (tolerance {args.tolerance:.0e}, labels must match exactly)")
+        sys.exit(1)
+
+    row = df.iloc[:1]
+    single_pipe = time_call(lambda: model.predict_proba(transform_features(row, scaler, encoders, features=features)), args.repeat)
+    single_comp = time_call(lambda: compiled.predict_proba(row), args.repeat)
+    batch_pipe = time_call(lambda: model.predict_proba(transform_features(df, scaler, encoders, features=features)), 5)
+    batch_comp = time_call(lambda: compiled.predict_proba(df), 5)
+
+    print(f"Single row : pipeline {single_pipe * 1e6:8.1f} us | compiled {single_comp * 1e6:8.1f} us")
+    print(f"{len(df)} rows : pipeline {batch_pipe * 1e3:8.1f} ms | compiled {batch_comp * 1e3:8.1f} ms")
+    print(f"Cold import: pipeline {_format_import(import_seconds('import joblib, sklearn.pipeline, xgboost, imblearn'))} | "
+          f"compiled {_format_import(import_seconds('import compiled_model'))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from feature_engineering import FEATURES, FeatureEngineer
+
+
+def synthetic_frame(n_rows, seed=42):
+    rng = np.random.default_rng(seed)
+    cols = sorted({c for _, _, left, right in FEATURES for c in (left, right)})
+    return pd.DataFrame(rng.random((n_rows, len(cols))) * 1000, columns=cols)
+
+
+def legacy_transform(X):
+    # The per-column insertion pattern the train_* functions used before feature_engineering.py
+    X = X.copy()
+    for name, op, left, right in FEATURES:
+        if op == "mul":
+            X[name] = X[left] * X[right]
+        else:
+            X[name] = X[left] / (X[right] + 1)
+    return X
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark feature engineering throughput on large frames.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'legacy rows/s':>15} {'frame rows/s':>15} {'array rows/s':>15}")
+    for n in args.rows:
+        X = synthetic_frame(n)
+        fe = FeatureEngineer().fit(X)
+        values = X.to_numpy()
+
+        expected = legacy_transform(X)[fe.output_columns_].to_numpy()
+        assert np.allclose(expected, fe.transform_array(values))
+
+        legacy = best_of(lambda: legacy_transform(X), args.repeat)
+        frame = best_of(lambda: fe.transform(X), args.repeat)
+        array = best_of(lambda: fe.transform_array(values), args.repeat)
+        print(f"{n:>10} {n / legacy:>15,.0f} {n / frame:>15,.0f} {n / array:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from convert_dataset import FORMATS, convert, default_output
+
+# Each format is loaded in a fresh interpreter so peak RSS isn't polluted by earlier loads
+_PROBE = """
+import json, resource, sys, time
+import pandas as pd
+from preprocessing_script import load_data
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t = time.perf_counter()
+df = load_data(sys.argv[1])
+total = float(df.select_dtypes("number").sum().sum())  # touch the data so lazy maps are paged in
+elapsed = time.perf_counter() - t
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "rss_kb": peak - base, "rows": len(df)}))
+"""
+
+
+def probe(path, repeat):
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _PROBE, path], capture_output=True, text=True,
+                             check=True, cwd=os.getcwd(), env={**os.environ, "PYTHONPATH": src_dir})
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return min(runs, key=lambda r: r["seconds"])
+
+
+def disk_bytes(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark load time and peak RSS per dataset format.")
+    parser.add_argument("--data", default="data/flood_risk_dataset_india.csv")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = {"csv": args.data}
+    for fmt in FORMATS:
+        paths[fmt] = default_output(args.data, fmt)
+        if not os.path.exists(paths[fmt]):
+            convert(args.data, paths[fmt], fmt)
+
+    print(f"{'format':<8} {'rows':>10} {'disk MB':>9} {'load ms':>9} {'peak RSS MB':>12}")
+    for fmt, path in paths.items():
+        r = probe(path, args.repeat)
+        print(f"{fmt:<8} {r['rows']:>10} {disk_bytes(path) / 1024 ** 2:>9.2f} "
+              f"{r['seconds'] * 1000:>9.1f} {r['rss_kb'] / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import importlib
+
+import numpy as np
+from sklearn.metrics import f1_score
+
+import instrumentation
+from instrumentation import stage
+from preprocessing_script import load_and_preprocess
+from rebalance import REBALANCE_MODES
+
+# key -> (module, train function, extra options keeping the run short)
+MODELS = {
+    "rf": ("randomforest_model", "train_random_forest", {"mode": "fast"}),
+    "svm": ("svm_model", "train_svm", {"mode": "nystroem"}),
+    "xgb": ("xgboost_model", "train_xgboost", {"search": "halving"}),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit time, peak memory and macro F1 per rebalancing strategy.")
+    parser.add_argument("--data", default="data/flood_risk_dataset_india.csv")
+    parser.add_argument("--models", nargs="+", choices=sorted(MODELS), default=sorted(MODELS))
+    parser.add_argument("--modes", nargs="+", choices=REBALANCE_MODES, default=list(REBALANCE_MODES))
+    parser.add_argument("--exact", action="store_true",
+                        help="Use each model's default (slow) settings instead of the short ones")
+    args = parser.parse_args()
+
+    X_train, X_test, y_train, y_test, _, _, _ = load_and_preprocess(args.data)
+    X_train, y_train = np.asarray(X_train), np.asarray(y_train)
+    instrumentation.configure(memory=True)
+
+    print(f"{'model':>5} {'mode':>13} {'rebalance s':>12} {'fit s':>8} {'total s':>8} "
+          f"{'peak MB':>8} {'macro F1':>9}")
+    for key in args.models:
+        module_name, train_fn, options = MODELS[key]
+        module = importlib.import_module(module_name)
+        for mode in args.modes:
+            instrumentation.reset()
+            with stage("total"):
+                model, _ = getattr(module, train_fn)(X_train, y_train, rebalance_mode=mode,
+                                                     **({} if args.exact else options))
+            s = instrumentation.stages()
+            proba = model.predict_proba(X_test)
+            f1 = f1_score(y_test, model.classes_[proba.argmax(axis=1)], average="macro")
+            print(f"{key:>5} {mode:>13} {s['rebalance']['wall_s']:>12.2f} {s['fit']['wall_s']:>8.2f} "
+                  f"{s['total']['wall_s']:>8.2f} {s['total']['peak_mb']:>8.1f} {f1:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Cold-start cost of the entry points: the top-level imports of each script are replayed in a fresh
+# interpreter under `python -X importtime`, so the numbers track what the module graph pulls in.
+TARGETS = {
+    "app": "app.py",
+    "trainer": "main.py",
+    "batch scorer": "predict.py",
+}
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def top_level_imports(script):
+    with open(os.path.join(SRC_DIR, script)) as fh:
+        tree = ast.parse(fh.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def parse_importtime(stderr):
+    # "import time: self [us] | cumulative | imported package", nesting shown by indentation
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.startswith("  "):
+            continue
+        packages[name.strip()] = int(cumulative) / 1000
+    return packages
+
+
+def probe(script, model_file=None):
+    code = top_level_imports(script)
+    if model_file:
+        code += f"\nfrom model_registry import get_bundle\nget_bundle({model_file!r})"
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                         check=True, cwd=os.getcwd(), env={**os.environ, "PYTHONPATH": SRC_DIR})
+    wall = time.perf_counter() - start
+    packages = parse_importtime(out.stderr)
+    return {"wall_ms": wall * 1000, "import_ms": sum(packages.values()), "modules": len(packages), "packages": packages}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold-start import time of the entry points.")
+    parser.add_argument("--targets", nargs="+", choices=sorted(TARGETS), default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Slowest top-level imports to list")
+    parser.add_argument("--model", default=None,
+                        help="Also load this bundle in the app / batch scorer probes, as they do on start")
+    parser.add_argument("--output", default=None, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.targets:
+        script = TARGETS[name]
+        model_file = args.model if name != "trainer" else None
+        runs = [probe(script, model_file) for _ in range(args.repeat)]
+        best = min(runs, key=lambda r: r["wall_ms"])
+        results[name] = best
+
+        print(f"\n{name} ({script}): {best['wall_ms']:.0f} ms interpreter wall, "
+              f"{best['import_ms']:.0f} ms in top-level imports")
+        for pkg, ms in sorted(best["packages"].items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"  {pkg:<30} {ms:8.1f} ms")
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(results, fh, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import time
+
+import numpy as np
+
+from preprocessing_script import load_and_preprocess
+from svm_model import train_svm
+
+
+def upsample(X, y, n_rows, seed=42):
+    # Jittered copies of the real rows, to see how each mode scales past the 10k-row sample
+    if n_rows <= len(X):
+        return X[:n_rows], y[:n_rows]
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(X), n_rows)
+    return X[idx] + rng.normal(0, 0.05, (n_rows, X.shape[1])), y[idx]
+
+
+def latency_percentiles(model, X, n=500):
+    times = []
+    for i in range(min(n, len(X))):
+        start = time.perf_counter()
+        model.predict_proba(X[i:i + 1])
+        times.append(time.perf_counter() - start)
+    return np.percentile(times, 50) * 1e3, np.percentile(times, 99) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact SVC vs kernel-approximated linear SVM.")
+    parser.add_argument("--data", default="data/flood_risk_dataset_india.csv")
+    parser.add_argument("--rows", type=int, nargs="+", default=[8_000, 32_000])
+    parser.add_argument("--modes", nargs="+", default=["exact", "nystroem", "rff"])
+    parser.add_argument("--n-components", type=int, default=500)
+    parser.add_argument("--exact-max-rows", type=int, default=40_000, help="Skip the exact SVC above this size")
+    args = parser.parse_args()
+
+    X_train, X_test, y_train, y_test, _, _, _ = load_and_preprocess(args.data)
+    X_train, y_train = np.asarray(X_train), np.asarray(y_train)
+    X_test, y_test = np.asarray(X_test), np.asarray(y_test)
+
+    print(f"{'rows':>8} {'mode':>9} {'fit s':>8} {'p50 ms':>8} {'p99 ms':>8} {'batch rows/s':>13} {'accuracy':>9}")
+    for n in args.rows:
+        X, y = upsample(X_train, y_train, n)
+        for mode in args.modes:
+            if mode == "exact" and n > args.exact_max_rows:
+                print(f"{n:>8} {mode:>9} {'skipped':>8}")
+                continue
+            start = time.perf_counter()
+            model, _ = train_svm(X, y, mode=mode, n_components=args.n_components)
+            fit = time.perf_counter() - start
+
+            p50, p99 = latency_percentiles(model, X_test)
+            start = time.perf_counter()
+            proba = model.predict_proba(X_test)
+            batch = len(X_test) / (time.perf_counter() - start)
+            acc = float((proba.argmax(axis=1) == y_test).mean())
+            print(f"{n:>8} {mode:>9} {fit:>8.2f} {p50:>8.2f} {p99:>8.2f} {batch:>13,.0f} {acc:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
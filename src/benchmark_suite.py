@@ -0,0 +1,186 @@
+import argparse
+import datetime
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import artifact_store
+from preprocessing_script import load_data, preprocess_data, transform_features
+
+# Benchmark harness for the load / preprocess / train / evaluate / predict paths.
+# Results are written as JSON and compared against a baseline file so regressions fail the run:
+#   python src/benchmark_suite.py --sizes 10000 100000 --save-baseline
+#   python src/benchmark_suite.py --sizes 10000 100000 --baseline benchmarks/baseline.json
+RESULTS_DIR = "benchmarks"
+BASELINE_FILE = os.path.join(RESULTS_DIR, "baseline.json")
+
+# Same columns and value ranges as data/flood_risk_dataset_india.csv
+NUMERIC_RANGES = {
+    "Latitude": (8.0, 37.0),
+    "Longitude": (68.0, 97.0),
+    "Rainfall": (0.0, 300.0),
+    "Temperature": (15.0, 45.0),
+    "Humidity": (20.0, 100.0),
+    "River Discharge": (0.0, 5000.0),
+    "Water Level": (0.0, 10.0),
+    "Elevation": (1.0, 8850.0),
+}
+CATEGORIES = {
+    "Land Cover": ["Water Body", "Desert", "Forest", "Agricultural", "Urban"],
+    "Soil Type": ["Peat", "Silt", "Clay", "Loam", "Sandy"],
+}
+COLUMN_ORDER = [
+    "Latitude", "Longitude", "Rainfall", "Temperature", "Humidity", "River Discharge", "Water Level",
+    "Elevation", "Land Cover", "Soil Type", "Population Density", "Infrastructure", "Historical Floods",
+    "Flood Occurred",
+]
+
+# key -> (module, train function, largest size it is benchmarked at by default)
+TRAINERS = {
+    "rf": ("randomforest_model", "train_random_forest", 100_000),
+    "svm": ("svm_model", "train_svm", 20_000),
+    "xgb": ("xgboost_model", "train_xgboost", 100_000),
+}
+
+
+def synthetic_dataset(n_rows, seed=42):
+    rng = np.random.default_rng(seed)
+    data = {col: rng.uniform(lo, hi, n_rows) for col, (lo, hi) in NUMERIC_RANGES.items()}
+    for col, cats in CATEGORIES.items():
+        data[col] = rng.choice(cats, n_rows)
+    data["Population Density"] = rng.uniform(0, 10_000, n_rows)
+    data["Infrastructure"] = rng.integers(0, 2, n_rows)
+    data["Historical Floods"] = rng.integers(0, 2, n_rows)
+    data["Flood Occurred"] = rng.integers(0, 2, n_rows)
+    return pd.DataFrame(data)[COLUMN_ORDER]
+
+
+def dataset_path(n_rows, data_dir):
+    path = os.path.join(data_dir, f"synthetic_{n_rows}.csv")
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        synthetic_dataset(n_rows).to_csv(path, index=False)
+    return path
+
+
+def measure(fn, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return {"seconds": min(times), "mean": float(np.mean(times)), "repeat": repeat}, result
+
+
+def run_suite(sizes, repeat=3, trainers=tuple(TRAINERS), train_max_rows=None, models=(), data_dir=None):
+    data_dir = data_dir or os.path.join(RESULTS_DIR, "data")
+    results = {}
+
+    def record(name, fn, n=repeat):
+        stats, out = measure(fn, n)
+        results[name] = stats
+        print(f"{name:<45} {stats['seconds'] * 1e3:10.2f} ms")
+        return out
+
+    for n in sizes:
+        path = dataset_path(n, data_dir)
+        df = record(f"load_data[{n}]", lambda: load_data(path))
+        X_train, X_test, y_train, y_test, scaler, encoders, features = record(
+            f"preprocess_data[{n}]", lambda: preprocess_data(df))
+
+        for key in trainers:
+            module_name, train_fn, default_max = TRAINERS[key]
+            if n > (train_max_rows or default_max):
+                continue
+            module = importlib.import_module(module_name)
+            # Training is slow, one timed run is enough
+            model, _ = record(f"train[{key}][{n}]", lambda: getattr(module, train_fn)(X_train, y_train), n=1)
+            record(f"evaluate_model[{key}][{n}]", lambda: module.evaluate_model(model, X_test, y_test))
+
+    # Inference on every saved bundle: one row at a time vs one vectorized batch
+    rows = synthetic_dataset(1000, seed=7).drop(columns=["Flood Occurred"])
+    for model_file in models:
+        import joblib
+        bundle = joblib.load(model_file)
+        name = os.path.basename(model_file)
+        if name == artifact_store.BUNDLE_FILE:
+            # artifacts/<name>/<version>/bundle.joblib, keyed by model so baselines survive retraining
+            name = os.path.basename(os.path.dirname(os.path.dirname(model_file)))
+        X = transform_features(rows, bundle["scaler"], bundle["encoders"], features=bundle.get("features"))
+        model = bundle["model"]
+        record(f"predict_proba_single[{name}]", lambda: model.predict_proba(X[:1]), n=max(repeat, 50))
+        record(f"predict_proba_batch1000[{name}]", lambda: model.predict_proba(X))
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f"\n{'benchmark':<45} {'baseline ms':>12} {'current ms':>12} {'change':>8}")
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]["seconds"], stats["seconds"]
+        change = (new - old) / old if old else 0.0
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<45} {old * 1e3:12.2f} {new * 1e3:12.2f} {change:+8.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark load, preprocess, train, evaluate and predict.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--trainers", nargs="*", choices=sorted(TRAINERS), default=sorted(TRAINERS))
+    parser.add_argument("--train-max-rows", type=int, default=None,
+                        help="Override the per-model size cap for the train benchmarks")
+    parser.add_argument("--models", nargs="*", default=None,
+                        help="Bundles to benchmark (default: the current version of every model in the artifact store)")
+    parser.add_argument("--baseline", default=None, help="Compare against this results file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown before failing")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Also write results to {BASELINE_FILE}")
+    args = parser.parse_args()
+
+    models = args.models if args.models is not None else [artifact_store.resolve(m) for m in artifact_store.models()]
+    results = run_suite(args.sizes, args.repeat, args.trainers, args.train_max_rows, models)
+
+    payload = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out = os.path.join(RESULTS_DIR, f"results-{datetime.datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(out, "w") as fh:
+        json.dump(payload, fh, indent=2)
+    print(f"\nResults written to {out}")
+    if args.save_baseline:
+        with open(BASELINE_FILE, "w") as fh:
+            json.dump(payload, fh, indent=2)
+        print(f"Baseline written to {BASELINE_FILE}")
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
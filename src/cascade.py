@@ -0,0 +1,125 @@
+import argparse
+import time
+
+import numpy as np
+
+from artifact_store import locate, publish
+from model_registry import get_bundle
+from preprocessing_script import load_data, transform_features
+
+# Two-stage predictor: every row is scored by a cheap bundle, and only rows whose flood
+# probability lands inside the uncertainty band (low, high) are re-scored by the expensive one
+# (tuned XGBoost, SVM). Both bundles keep their own scaler / encoders / features, so any two
+# bundles in the artifact store (or written by save_model) can be combined.
+FAST_MODEL_NAME = "Cascade Fast"
+
+
+def _score(bundle, df, target_col):
+    X = transform_features(df, bundle["scaler"], bundle["encoders"], target_col, bundle.get("features"))
+    return bundle["model"].predict_proba(X)[:, 1]
+
+
+class CascadePredictor:
+    def __init__(self, fast_bundle, slow_bundle, low=0.3, high=0.7, target_col="Flood Occurred"):
+        if not 0.0 <= low <= high <= 1.0:
+            raise ValueError(f"Uncertainty band must satisfy 0 <= low <= high <= 1, got ({low}, {high})")
+        self.fast = fast_bundle
+        self.slow = slow_bundle
+        self.low, self.high = low, high
+        self.target_col = target_col
+        self.stats = {"rows": 0, "escalated": 0}
+
+    @classmethod
+    def from_files(cls, fast, slow, low=0.3, high=0.7):
+        # Bundle paths or artifact store model names
+        return cls(get_bundle(locate(fast)), get_bundle(locate(slow)), low, high)
+
+    def predict_proba(self, df):
+        p1 = _score(self.fast, df, self.target_col)
+        uncertain = (p1 > self.low) & (p1 < self.high)
+        if uncertain.any():
+            p1[uncertain] = _score(self.slow, df[uncertain], self.target_col)
+        self.stats["rows"] += len(p1)
+        self.stats["escalated"] += int(uncertain.sum())
+        return np.column_stack([1.0 - p1, p1])
+
+    def predict(self, df):
+        return (self.predict_proba(df)[:, 1] >= 0.5).astype(int)
+
+    def escalation_rate(self):
+        return self.stats["escalated"] / self.stats["rows"] if self.stats["rows"] else 0.0
+
+
+def train_fast_model(data_path, kind="tree", model_name=FAST_MODEL_NAME):
+    # Shallow tree or logistic regression on the same preprocessing / split as main.py
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.tree import DecisionTreeClassifier
+    from preprocessing_script import load_and_preprocess
+    from evaluation import evaluate_model
+
+    X_train, X_test, y_train, y_test, scaler, encoders, features = load_and_preprocess(data_path)
+    if kind == "tree":
+        model = DecisionTreeClassifier(max_depth=6, class_weight="balanced", random_state=42)
+    else:
+        model = LogisticRegression(class_weight="balanced", max_iter=1000)
+    model.fit(X_train, y_train)
+    evaluate_model(model, X_test, y_test)
+    return publish(model, scaler, encoders, model_name, features=features)
+
+
+def holdout_rows(df, target_col="Flood Occurred", test_size=0.2, random_state=42):
+    # Raw rows of the test split made by preprocess_data (same dropna, stratify and seed)
+    from sklearn.model_selection import train_test_split
+    df = df.dropna()
+    _, test_idx = train_test_split(np.arange(len(df)), test_size=test_size, random_state=random_state,
+                                   stratify=df[target_col])
+    return df.iloc[np.sort(test_idx)]
+
+
+def compare(fast, slow, df, bands, target_col="Flood Occurred"):
+    y = df[target_col].to_numpy()
+    fast, slow = get_bundle(locate(fast)), get_bundle(locate(slow))
+    start = time.perf_counter()
+    slow_pred = (_score(slow, df, target_col) >= 0.5).astype(int)
+    slow_seconds = time.perf_counter() - start
+    slow_acc = float((slow_pred == y).mean())
+
+    print(f"Expensive model only: accuracy {slow_acc:.4f}, {len(df) / slow_seconds:,.0f} rows/sec")
+    print(f"{'band':>11} {'escalated':>10} {'rows/sec':>12} {'speedup':>8} {'accuracy':>9} {'vs slow':>8}")
+    results = []
+    for low, high in bands:
+        cascade = CascadePredictor(fast, slow, low, high, target_col)
+        start = time.perf_counter()
+        pred = cascade.predict(df)
+        seconds = time.perf_counter() - start
+        acc = float((pred == y).mean())
+        results.append({"low": low, "high": high, "escalation_rate": cascade.escalation_rate(),
+                        "rows_per_sec": len(df) / seconds, "accuracy": acc, "accuracy_delta": acc - slow_acc})
+        print(f"{low:>5.2f}-{high:<5.2f} {cascade.escalation_rate():>10.2%} {len(df) / seconds:>12,.0f} "
+              f"{slow_seconds / seconds:>7.1f}x {acc:>9.4f} {acc - slow_acc:>+8.4f}")
+    return results
+
+
+def _band(text):
+    low, high = text.split(":")
+    return float(low), float(high)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cheap model first, expensive model for uncertain rows.")
+    parser.add_argument("--fast", default=FAST_MODEL_NAME, help="Cheap bundle path or store name (see --train-fast)")
+    parser.add_argument("--slow", default="XGBoost (Tuned)", help="Expensive bundle path or store name")
+    parser.add_argument("--data", default="data/flood_risk_dataset_india.csv")
+    parser.add_argument("--bands", type=_band, nargs="+", default=[(0.4, 0.6), (0.3, 0.7), (0.2, 0.8)],
+                        help="Uncertainty bands as low:high")
+    parser.add_argument("--train-fast", choices=["tree", "logistic"], default=None,
+                        help="Train and save the cheap bundle first")
+    args = parser.parse_args()
+
+    if args.train_fast:
+        train_fast_model(args.data, args.train_fast, args.fast)
+    compare(args.fast, args.slow, holdout_rows(load_data(args.data)), args.bands)
+
+
+if __name__ == "__main__":
+    main()
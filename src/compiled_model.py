@@ -0,0 +1,157 @@
+import json
+
+import numpy as np
+
+from feature_engineering import compute_features
+
+# NumPy-only predictor for artifacts written by export_model.export_compiled_model.
+# Importing this module does not pull in sklearn, imblearn, xgboost or pandas.
+
+FORMAT_VERSION = 1
+
+
+def _column(data, name, position):
+    # Accepts a DataFrame / dict of columns or an already ordered 2-D array
+    if isinstance(data, np.ndarray):
+        return data[:, position]
+    return np.asarray(data[name])
+
+
+def _encode(values, vocab):
+    # Same as LabelEncoder.transform but unseen labels become -1 instead of raising
+    if values.dtype.kind in "biuf":
+        return values.astype(np.float64)
+    vocab = np.asarray(vocab)
+    values = values.astype(vocab.dtype)
+    pos = np.clip(np.searchsorted(vocab, values), 0, len(vocab) - 1)
+    return np.where(vocab[pos] == values, pos, -1).astype(np.float64)
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _couple_two_classes(r, eps=0.005 / 2, max_iter=100):
+    # libsvm's multiclass_probability for k=2, which SVC.predict_proba runs on top of Platt scaling.
+    # r is the pairwise P(class 0 | class 0 or 1); each row iterates until its own stopping test passes.
+    q = [[(1.0 - r) ** 2, -(1.0 - r) * r], [-(1.0 - r) * r, r ** 2]]
+    p = [np.full_like(r, 0.5), np.full_like(r, 0.5)]
+    active = np.ones(len(r), dtype=bool)
+    for _ in range(max_iter):
+        qp = [q[t][0] * p[0] + q[t][1] * p[1] for t in range(2)]
+        pqp = p[0] * qp[0] + p[1] * qp[1]
+        active &= np.maximum(np.abs(qp[0] - pqp), np.abs(qp[1] - pqp)) >= eps
+        if not active.any():
+            break
+        for t in range(2):
+            diff = np.where(active, (pqp - qp[t]) / q[t][t], 0.0)
+            p[t] = p[t] + diff
+            pqp = (pqp + diff * (diff * q[t][t] + 2 * qp[t])) / (1 + diff) ** 2
+            for j in range(2):
+                qp[j] = (qp[j] + diff * q[t][j]) / (1 + diff)
+                p[j] = p[j] / (1 + diff)
+    return np.column_stack(p)
+
+
+class CompiledModel:
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        self.arrays = arrays
+        self.classes = np.asarray(meta["classes"])
+        self.kind = meta["model"]["kind"]
+        if self.kind in ("forest", "xgboost"):
+            a = arrays
+            self._is_leaf = a["left"] < 0
+            # Leaves point at themselves so the traversal can run a fixed number of steps
+            idx = np.arange(len(a["left"]))
+            self._left = np.where(self._is_leaf, idx, a["left"])
+            self._right = np.where(self._is_leaf, idx, a["right"])
+            self._feature = np.where(self._is_leaf, 0, a["feature"])
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as npz:
+            arrays = {k: npz[k] for k in npz.files if k != "meta"}
+            meta = json.loads(str(npz["meta"]))
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format: {meta.get('format_version')}")
+        return cls(meta, arrays)
+
+    # ----------------- Preprocessing -----------------
+    def transform(self, data):
+        # Outer stage: label encoding + feature engineering + StandardScaler from preprocess_data
+        features = self.meta.get("features")
+        columns = features["input_columns"] if features else self.meta["columns"]
+        vocabs = self.meta["encoders"]
+        n_rows = len(_column(data, columns[0], 0))
+        X = np.empty((n_rows, len(self.meta["columns"])), dtype=np.float64)
+        for j, col in enumerate(columns):
+            values = _column(data, col, j)
+            X[:, j] = _encode(values, vocabs[col]) if col in vocabs else values
+        if features:
+            compute_features(X[:, :len(columns)], features["specs"], out=X[:, len(columns):])
+        X = (X - self.arrays["scaler_mean"]) / self.arrays["scaler_scale"]
+
+        # Inner stage: the pipeline's ColumnTransformer
+        blocks = []
+        for i, step in enumerate(self.meta["preprocessor"]):
+            cols = X[:, step["columns"]]
+            if step["kind"] == "scale":
+                blocks.append((cols - self.arrays[f"pre{i}_mean"]) / self.arrays[f"pre{i}_scale"])
+            elif step["kind"] == "onehot":
+                for j in range(len(step["columns"])):
+                    cats = self.arrays[f"pre{i}_cats{j}"]
+                    blocks.append((cols[:, [j]] == cats[None, :]).astype(np.float64))
+            else:
+                blocks.append(cols)
+        return np.hstack(blocks) if blocks else X
+
+    # ----------------- Models -----------------
+    def _traverse(self, X, strict_less):
+        a = self.arrays
+        roots = a["roots"]
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(roots, (len(X), len(roots))).copy()
+        for _ in range(int(self.meta["model"]["max_depth"])):
+            x = X[rows, self._feature[nodes]]
+            thr = a["threshold"][nodes]
+            go_left = x < thr if strict_less else x <= thr
+            if "missing" in a:
+                go_left = np.where(np.isnan(x), a["missing"][nodes] == self._left[nodes], go_left)
+            nodes = np.where(go_left, self._left[nodes], self._right[nodes])
+        return nodes
+
+    def _forest_proba(self, X):
+        # sklearn trees compare float32 features against float64 thresholds
+        nodes = self._traverse(X.astype(np.float32).astype(np.float64), strict_less=False)
+        return self.arrays["value"][nodes].mean(axis=1)
+
+    def _xgboost_proba(self, X):
+        # XGBoost goes left when x < split_condition, both in float32
+        nodes = self._traverse(X.astype(np.float32), strict_less=True)
+        margin = self.meta["model"]["base_margin"] + self.arrays["leaf"][nodes].sum(axis=1)
+        p1 = _sigmoid(margin)
+        return np.column_stack([1.0 - p1, p1])
+
+    def _svm_proba(self, X):
+        a = self.arrays
+        sv = a["support_vectors"]
+        sq = (X ** 2).sum(axis=1)[:, None] + (sv ** 2).sum(axis=1)[None, :] - 2.0 * X @ sv.T
+        K = np.exp(-self.meta["model"]["gamma"] * np.maximum(sq, 0.0))
+        dec = K @ a["dual_coef"] + self.meta["model"]["intercept"]
+        # libsvm's Platt scaling gives the pairwise probability of the first class, then pairwise coupling
+        p0 = 1.0 / (1.0 + np.exp(dec * self.meta["model"]["prob_a"] + self.meta["model"]["prob_b"]))
+        return _couple_two_classes(np.clip(p0, 1e-7, 1 - 1e-7))
+
+    def predict_proba(self, data, batch_size=10_000):
+        X = self.transform(data)
+        score = getattr(self, f"_{self.kind}_proba")
+        out = [score(X[i:i + batch_size]) for i in range(0, len(X), batch_size)]
+        return np.vstack(out) if out else np.empty((0, len(self.classes)))
+
+    def predict(self, data):
+        return self.classes[self.predict_proba(data).argmax(axis=1)]
+
+
+def load_compiled_model(path):
+    return CompiledModel.load(path)
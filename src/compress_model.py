@@ -0,0 +1,241 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import joblib
+import numpy as np
+
+from preprocessing_script import load_data, transform_features
+
+# Smaller variants of a saved bundle for low-memory servers. The output is still a regular
+# save_model bundle (joblib, same keys), so model_registry.get_bundle / predict.py / app.py load it
+# unchanged:
+#   forest  - subtrees below --max-depth collapse into leaves, class fractions are quantized to
+#             --bits, thresholds are rounded down to float32 (lossless for float32 inputs)
+#   xgboost - trees past --max-trees dropped, splits gaining less than --gamma pruned with
+#             XGBoost's prune updater, leaf values quantized to --bits
+#   svm     - RBF SVC refitted on a --sv-fraction subset of its support vectors (margin ones first)
+#   scaler  - StandardScaler parameters (bundle and pipeline) stored as float32
+# Quantized arrays keep their dtype but compress far better, hence the joblib compression. A compressed
+# file can't be opened with mmap_mode (artifact_store.load / get_bundle), use --compress 0 for that.
+_PROBE = """
+import json, resource, sys, time
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t = time.perf_counter()
+import joblib
+bundle = joblib.load(sys.argv[1])
+elapsed = time.perf_counter() - t
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "rss_kb": peak - base}))
+"""
+
+
+def _quantize(values, bits, lo=None, hi=None):
+    lo = values.min() if lo is None else lo
+    hi = values.max() if hi is None else hi
+    if hi <= lo:
+        return values
+    step = (hi - lo) / (2 ** bits - 1)
+    return lo + np.round((values - lo) / step) * step
+
+
+def _floor_float32(values):
+    # Largest float32 <= each threshold, so x <= t gives the same answer for every float32 x
+    t32 = values.astype(np.float32)
+    t32 = np.where(t32 > values, np.nextafter(t32, np.float32(-np.inf)), t32)
+    return t32.astype(np.float64)
+
+
+def compress_tree(tree, max_depth=None, bits=8):
+    # Rebuilds a fitted sklearn Tree with only the nodes above max_depth, renumbered breadth-first
+    state = tree.__getstate__()
+    nodes, values = state["nodes"], state["values"]
+    keep, depth = [0], [0]
+    for nid, d in zip(keep, depth):  # keep grows while iterating
+        left = nodes[nid]["left_child"]
+        if left != -1 and (max_depth is None or d < max_depth):
+            keep.extend([left, nodes[nid]["right_child"]])
+            depth.extend([d + 1, d + 1])
+    keep = np.asarray(keep)
+    new_id = np.full(len(nodes), -1, dtype=np.int64)
+    new_id[keep] = np.arange(len(keep))
+
+    new_nodes = nodes[keep].copy()
+    left, right = new_nodes["left_child"], new_nodes["right_child"]
+    is_leaf = (left == -1) | (new_id[np.maximum(left, 0)] == -1)
+    new_nodes["left_child"] = np.where(is_leaf, -1, new_id[np.maximum(left, 0)])
+    new_nodes["right_child"] = np.where(is_leaf, -1, new_id[np.maximum(right, 0)])
+    new_nodes["feature"] = np.where(is_leaf, -2, new_nodes["feature"])
+    new_nodes["threshold"] = np.where(is_leaf, -2.0, _floor_float32(new_nodes["threshold"]))
+
+    new_values = values[keep]
+    totals = new_values.sum(axis=-1, keepdims=True)
+    fractions = np.divide(new_values, totals, out=np.zeros_like(new_values), where=totals > 0)
+    new_values = _quantize(fractions, bits, 0.0, 1.0) if bits else fractions
+
+    new_state = dict(state, nodes=new_nodes, values=np.ascontiguousarray(new_values, dtype=np.float64),
+                     node_count=len(keep), max_depth=int(max(depth)))
+    new_tree = type(tree)(tree.n_features, tree.n_classes, tree.n_outputs)
+    new_tree.__setstate__(new_state)
+    return new_tree
+
+
+def compress_forest(clf, max_depth=None, bits=8, max_trees=None):
+    if max_trees is not None:
+        clf.estimators_ = clf.estimators_[:max_trees]
+        clf.n_estimators = len(clf.estimators_)
+    for est in clf.estimators_:
+        est.tree_ = compress_tree(est.tree_, max_depth, bits)
+    return clf
+
+
+def compress_xgboost(clf, X_train=None, y_train=None, bits=8, max_trees=None, gamma=0.0):
+    import xgboost as xgb
+
+    booster = clf.get_booster()
+    if max_trees is not None and max_trees < booster.num_boosted_rounds():
+        booster = booster[:max_trees]
+    if gamma > 0 and X_train is not None:
+        # process_type=update re-runs only the prune updater over the existing trees
+        booster = xgb.train({"process_type": "update", "updater": "prune", "gamma": gamma},
+                            xgb.DMatrix(X_train, label=y_train), num_boost_round=booster.num_boosted_rounds(),
+                            xgb_model=booster)
+
+    if bits:
+        model = json.loads(booster.save_raw("json"))
+        trees = model["learner"]["gradient_booster"]["model"]["trees"]
+        leaves = [np.asarray(t["left_children"]) == -1 for t in trees]
+        all_leaves = np.concatenate([np.asarray(t["split_conditions"])[m] for t, m in zip(trees, leaves)])
+        lo, hi = float(all_leaves.min()), float(all_leaves.max())
+        for tree, is_leaf in zip(trees, leaves):
+            sc = np.asarray(tree["split_conditions"], dtype=np.float64)
+            sc[is_leaf] = _quantize(sc[is_leaf], bits, lo, hi)
+            tree["split_conditions"] = sc.tolist()
+        booster = xgb.Booster()
+        booster.load_model(bytearray(json.dumps(model).encode()))
+
+    if hasattr(clf, "_Booster"):
+        clf._Booster = booster
+        clf.n_estimators = booster.num_boosted_rounds()
+    else:  # out_of_core.BoosterClassifier
+        clf.booster = booster
+    return clf
+
+
+def compress_svm(clf, fraction=0.5, random_state=42):
+    # Margin support vectors (0 < |alpha| < C) define the boundary, bounded ones are subsampled
+    from sklearn.svm import SVC
+
+    if type(clf).__name__ != "SVC":
+        raise ValueError(f"Support-vector reduction needs an exact SVC, got {type(clf).__name__}")
+    rng = np.random.default_rng(random_state)
+    sv = clf.support_vectors_
+    labels = np.repeat(clf.classes_, clf.n_support_)
+    alpha = np.abs(clf.dual_coef_).max(axis=0)
+    keep = []
+    for i, c in enumerate(clf.classes_):
+        idx = np.flatnonzero(labels == c)
+        budget = max(2, int(len(idx) * fraction))
+        # With class_weight each class has its own box constraint C * class_weight_[i]
+        bound = clf.C * clf.class_weight_[i] * (1 - 1e-6)
+        margin = idx[alpha[idx] < bound]
+        bounded = idx[alpha[idx] >= bound]
+        chosen = margin[:budget] if len(margin) >= budget else \
+            np.concatenate([margin, rng.choice(bounded, min(len(bounded), budget - len(margin)), replace=False)])
+        keep.append(chosen)
+    keep = np.sort(np.concatenate(keep))
+
+    reduced = SVC(kernel="rbf", C=clf.C, gamma=clf._gamma, probability=True, class_weight=clf.class_weight,
+                  random_state=42)
+    reduced.fit(sv[keep], labels[keep])
+    print(f"SVM support vectors: {len(sv)} -> {len(reduced.support_vectors_)}")
+    return reduced
+
+
+def float32_scaler(scaler):
+    for attr in ("mean_", "scale_", "var_"):
+        if getattr(scaler, attr, None) is not None:
+            setattr(scaler, attr, np.asarray(getattr(scaler, attr), dtype=np.float32))
+    return scaler
+
+
+def compress_bundle(bundle, X_train=None, y_train=None, bits=8, max_depth=None, max_trees=None, gamma=0.0,
+                    sv_fraction=0.5):
+    model = bundle["model"]
+    steps = getattr(model, "steps", None)
+    clf = steps[-1][1] if steps else model
+    X_fit = model[:-1].transform(X_train) if steps and X_train is not None else X_train
+
+    kind = type(clf).__name__
+    if kind in ("RandomForestClassifier", "ExtraTreesClassifier"):
+        clf = compress_forest(clf, max_depth, bits, max_trees)
+    elif kind in ("XGBClassifier", "BoosterClassifier"):
+        clf = compress_xgboost(clf, X_fit, y_train, bits, max_trees, gamma)
+    elif kind == "SVC":
+        clf = compress_svm(clf, sv_fraction)
+    else:
+        print(f"No model compression for {kind}, only the scaler is converted")
+
+    if steps:
+        model.steps[-1] = (steps[-1][0], clf)
+        for _, transformer, _ in getattr(model.steps[0][1], "transformers_", []):
+            if type(transformer).__name__ == "StandardScaler":
+                float32_scaler(transformer)
+    else:
+        model = clf
+    return {**bundle, "model": model, "scaler": float32_scaler(bundle["scaler"])}
+
+
+def probe(path):
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    out = subprocess.run([sys.executable, "-c", _PROBE, path], capture_output=True, text=True, check=True,
+                         env={**os.environ, "PYTHONPATH": src_dir})
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def holdout_accuracy(bundle, df, target_col="Flood Occurred"):
+    X = transform_features(df, bundle["scaler"], bundle["encoders"], target_col, bundle.get("features"))
+    proba = bundle["model"].predict_proba(X)
+    return float((bundle["model"].classes_[proba.argmax(axis=1)] == df[target_col].to_numpy()).mean())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prune / quantize a saved bundle for low-memory deployment.")
+    parser.add_argument("model", help="Bundle path or artifact store model name")
+    parser.add_argument("--output", default=None, help="Default: <model>_compressed.pkl")
+    parser.add_argument("--data", default="data/flood_risk_dataset_india.csv")
+    parser.add_argument("--bits", type=int, default=8, help="Leaf value quantization (0 = off)")
+    parser.add_argument("--max-depth", type=int, default=None, help="Forest: collapse nodes below this depth")
+    parser.add_argument("--max-trees", type=int, default=None, help="Forest / XGBoost: keep the first N trees")
+    parser.add_argument("--gamma", type=float, default=0.0, help="XGBoost: prune splits gaining less than this")
+    parser.add_argument("--sv-fraction", type=float, default=0.5, help="SVM: share of support vectors kept")
+    parser.add_argument("--compress", type=int, default=3, help="joblib compression level (0 = none, needed for memory-mapped loading)")
+    args = parser.parse_args()
+    from artifact_store import locate
+    args.model = locate(args.model)
+    output = args.output or args.model.rsplit(".", 1)[0] + "_compressed.pkl"
+
+    from cascade import holdout_rows
+    from preprocessing_script import load_and_preprocess
+    X_train, _, y_train, _, _, _, _ = load_and_preprocess(args.data)
+    holdout = holdout_rows(load_data(args.data))
+
+    original = joblib.load(args.model)
+    before = holdout_accuracy(original, holdout)
+    compressed = compress_bundle(joblib.load(args.model), X_train, np.asarray(y_train), args.bits, args.max_depth,
+                                 args.max_trees, args.gamma, args.sv_fraction)
+    joblib.dump(compressed, output, compress=args.compress)
+    after = holdout_accuracy(joblib.load(output), holdout)
+
+    print(f"{'':>12} {'size KB':>9} {'load ms':>9} {'RSS MB':>8} {'accuracy':>9}")
+    for name, path, acc in (("original", args.model, before), ("compressed", output, after)):
+        p = probe(path)
+        print(f"{name:>12} {os.path.getsize(path) / 1024:>9.1f} {p['seconds'] * 1000:>9.1f} "
+              f"{p['rss_kb'] / 1024:>8.1f} {acc:>9.4f}")
+    print(f"Accuracy change: {after - before:+.4f}. Saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from preprocessing_script import load_data
+
+# Converts the CSV dataset into binary layouts that load_data can open without a text parse:
+#   parquet  - Parquet with categoricals dictionary-encoded
+#   feather  - uncompressed Arrow IPC file, memory-mapped on load
+#   npy      - directory of .npy blocks (one 2-D block per dtype, plus category codes) read with mmap_mode
+FORMATS = ("parquet", "feather", "npy")
+SCHEMA_FILE = "schema.json"
+
+
+def _with_categories(df):
+    df = df.copy()
+    for col in df.select_dtypes(include=["object"]).columns:
+        df[col] = df[col].astype("category")
+    return df
+
+
+def write_npy_dir(df, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    schema = {"n_rows": len(df), "columns": [str(c) for c in df.columns], "blocks": [], "categoricals": []}
+
+    # Numeric columns of the same dtype are stored as one (n_columns, n_rows) block, which is
+    # exactly pandas' internal layout, so the DataFrame can wrap the memory map without copying
+    numeric = df.select_dtypes(exclude=["category"])
+    for dtype, cols in numeric.columns.groupby(numeric.dtypes).items():
+        cols = [c for c in numeric.columns if c in set(cols)]
+        name = f"block_{np.dtype(dtype).name}.npy"
+        np.save(os.path.join(out_dir, name), np.ascontiguousarray(numeric[cols].to_numpy().T))
+        schema["blocks"].append({"file": name, "columns": cols})
+
+    for i, col in enumerate(df.select_dtypes(include=["category"]).columns):
+        name = f"codes_{i}.npy"
+        np.save(os.path.join(out_dir, name), df[col].cat.codes.to_numpy())
+        schema["categoricals"].append({"file": name, "column": col,
+                                       "categories": [str(c) for c in df[col].cat.categories]})
+
+    with open(os.path.join(out_dir, SCHEMA_FILE), "w") as fh:
+        json.dump(schema, fh, indent=2)
+
+
+def _open_npy_dir(path):
+    # Column name -> 1-D view of its memory-mapped block (rows of a C-contiguous block are contiguous),
+    # or (codes, categories) for categoricals
+    with open(os.path.join(path, SCHEMA_FILE)) as fh:
+        schema = json.load(fh)
+
+    columns = {}
+    for block in schema["blocks"]:
+        arr = np.load(os.path.join(path, block["file"]), mmap_mode="r")
+        for i, col in enumerate(block["columns"]):
+            columns[col] = arr[i]
+    for cat in schema["categoricals"]:
+        codes = np.load(os.path.join(path, cat["file"]), mmap_mode="r")
+        columns[cat["column"]] = (codes, cat["categories"])
+    # Dirs written before the column order was recorded keep the block order
+    return schema["n_rows"], schema.get("columns", list(columns)), columns
+
+
+def _npy_frame(order, columns, start, stop):
+    # One column per block with copy=False, so pandas keeps the memmap views instead of consolidating
+    data = {}
+    for col in order:
+        values = columns[col]
+        if isinstance(values, tuple):
+            data[col] = pd.Categorical.from_codes(values[0][start:stop], categories=values[1])
+        else:
+            data[col] = values[start:stop]
+    return pd.DataFrame(data, index=pd.RangeIndex(start, stop), copy=False)
+
+
+def read_npy_dir(path):
+    n_rows, order, columns = _open_npy_dir(path)
+    return _npy_frame(order, columns, 0, n_rows)
+
+
+def iter_npy_chunks(path, chunksize):
+    # Slices the memory maps per chunk, only the rows of the current chunk are paged in
+    n_rows, order, columns = _open_npy_dir(path)
+    for start in range(0, n_rows, chunksize):
+        yield _npy_frame(order, columns, start, min(start + chunksize, n_rows))
+
+
+def convert(input_path, output_path, fmt):
+    df = _with_categories(load_data(input_path))
+    if fmt == "parquet":
+        df.to_parquet(output_path, engine="pyarrow", index=False)
+    elif fmt == "feather":
+        # Uncompressed so the file can be memory-mapped instead of decoded
+        df.to_feather(output_path, compression="uncompressed")
+    elif fmt == "npy":
+        write_npy_dir(df, output_path)
+    else:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {FORMATS}")
+    print(f"Wrote {len(df)} rows to {output_path} ({fmt})")
+    return output_path
+
+
+def default_output(input_path, fmt):
+    stem = os.path.splitext(input_path)[0]
+    return f"{stem}.npy" if fmt == "npy" else f"{stem}.{fmt}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the flood dataset to a binary columnar format.")
+    parser.add_argument("input", help="CSV or XLSX dataset")
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    convert(args.input, args.output or default_output(args.input, args.format), args.format)
+
+
+if __name__ == "__main__":
+    main()
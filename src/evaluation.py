@@ -0,0 +1,143 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Shared evaluate_model for every train_* module (re-exported there). The test set is scored in
+# chunks on a thread pool with a single predict_proba pass; each chunk only updates small
+# accumulators (confusion matrix, score histograms, calibration bins), which are merged at the
+# end, so memory doesn't grow with the hold-out size and nothing is predicted twice.
+# Predictions are the argmax of predict_proba, which for SVC(probability=True) can differ from
+# SVC.predict on rows near the decision boundary.
+
+
+class StreamingMetrics:
+    def __init__(self, classes, n_calibration_bins=10, n_score_bins=10_000):
+        self.classes = np.asarray(classes)
+        k = len(self.classes)
+        self.confusion = np.zeros((k, k), dtype=np.int64)
+        self.n_calibration_bins = n_calibration_bins
+        # Binary only: histograms of the positive-class score for ROC-AUC and calibration
+        self.score_hist = np.zeros((2, n_score_bins), dtype=np.int64)
+        self.calib_count = np.zeros(n_calibration_bins, dtype=np.int64)
+        self.calib_proba = np.zeros(n_calibration_bins, dtype=np.float64)
+        self.calib_positive = np.zeros(n_calibration_bins, dtype=np.int64)
+
+    def update(self, y_true, proba):
+        k = len(self.classes)
+        true_idx = np.searchsorted(self.classes, np.asarray(y_true))
+        pred_idx = proba.argmax(axis=1)
+        self.confusion += np.bincount(true_idx * k + pred_idx, minlength=k * k).reshape(k, k)
+        if k != 2:
+            return self
+
+        score = proba[:, 1]
+        positive = true_idx == 1
+        n_score_bins = self.score_hist.shape[1]
+        score_bin = np.clip((score * n_score_bins).astype(np.int64), 0, n_score_bins - 1)
+        self.score_hist[1] += np.bincount(score_bin[positive], minlength=n_score_bins)
+        self.score_hist[0] += np.bincount(score_bin[~positive], minlength=n_score_bins)
+
+        calib_bin = np.clip((score * self.n_calibration_bins).astype(np.int64), 0, self.n_calibration_bins - 1)
+        self.calib_count += np.bincount(calib_bin, minlength=self.n_calibration_bins)
+        self.calib_proba += np.bincount(calib_bin, weights=score, minlength=self.n_calibration_bins)
+        self.calib_positive += np.bincount(calib_bin[positive], minlength=self.n_calibration_bins)
+        return self
+
+    def merge(self, other):
+        self.confusion += other.confusion
+        self.score_hist += other.score_hist
+        self.calib_count += other.calib_count
+        self.calib_proba += other.calib_proba
+        self.calib_positive += other.calib_positive
+        return self
+
+    def roc_auc(self):
+        # Mann-Whitney statistic on the score histograms, ties within a bin count as half
+        neg, pos = self.score_hist
+        n_neg, n_pos = neg.sum(), pos.sum()
+        if len(self.classes) != 2 or n_neg == 0 or n_pos == 0:
+            return None
+        neg_below = np.cumsum(neg) - neg
+        return float((pos * (neg_below + 0.5 * neg)).sum() / (n_pos * n_neg))
+
+    def calibration(self):
+        bins = []
+        for i in range(self.n_calibration_bins):
+            n = int(self.calib_count[i])
+            bins.append({
+                "bin": f"{i / self.n_calibration_bins:.1f}-{(i + 1) / self.n_calibration_bins:.1f}",
+                "count": n,
+                "mean_predicted": float(self.calib_proba[i] / n) if n else None,
+                "fraction_positive": float(self.calib_positive[i] / n) if n else None,
+            })
+        return bins
+
+    def report(self):
+        # Same layout as classification_report(output_dict=True), plus roc_auc and calibration
+        cm = self.confusion
+        support = cm.sum(axis=1)
+        predicted = cm.sum(axis=0)
+        tp = np.diag(cm)
+        precision = np.divide(tp, predicted, out=np.zeros(len(tp)), where=predicted > 0)
+        recall = np.divide(tp, support, out=np.zeros(len(tp)), where=support > 0)
+        denom = precision + recall
+        f1 = np.divide(2 * precision * recall, denom, out=np.zeros(len(tp)), where=denom > 0)
+
+        report = {}
+        for i, c in enumerate(self.classes):
+            report[str(c)] = {"precision": float(precision[i]), "recall": float(recall[i]),
+                              "f1-score": float(f1[i]), "support": int(support[i])}
+        total = int(support.sum())
+        report["accuracy"] = float(tp.sum() / total) if total else 0.0
+        report["macro avg"] = {"precision": float(precision.mean()), "recall": float(recall.mean()),
+                               "f1-score": float(f1.mean()), "support": total}
+        weights = support / total if total else np.zeros(len(support))
+        report["weighted avg"] = {"precision": float(precision @ weights), "recall": float(recall @ weights),
+                                  "f1-score": float(f1 @ weights), "support": total}
+        report["roc_auc"] = self.roc_auc()
+        if len(self.classes) == 2:
+            report["calibration"] = self.calibration()
+        return report
+
+
+def format_report(report):
+    lines = [f"{'':>14} {'precision':>9} {'recall':>9} {'f1-score':>9} {'support':>9}"]
+    for name, row in report.items():
+        if isinstance(row, dict):
+            lines.append(f"{name:>14} {row['precision']:9.4f} {row['recall']:9.4f} {row['f1-score']:9.4f} "
+                         f"{row['support']:9d}")
+    if report.get("roc_auc") is not None:
+        lines.append(f"{'roc auc':>14} {report['roc_auc']:9.4f}")
+    return "\n".join(lines)
+
+
+def _rows(X, start, end):
+    return X.iloc[start:end] if hasattr(X, "iloc") else X[start:end]
+
+
+def evaluate_model(model, X_test, y_test, chunk_size=50_000, n_jobs=None, verbose=True):
+    y_test = np.asarray(y_test)
+    n = len(y_test)
+    bounds = [(i, min(i + chunk_size, n)) for i in range(0, n, chunk_size)]
+    n_jobs = n_jobs or min(len(bounds), os.cpu_count() or 1)
+
+    def score(bound):
+        start, end = bound
+        return StreamingMetrics(model.classes_).update(y_test[start:end], model.predict_proba(_rows(X_test, start, end)))
+
+    # predict_proba of the tree ensembles, xgboost and libsvm releases the GIL, so threads overlap
+    with ThreadPoolExecutor(max_workers=max(1, n_jobs)) as pool:
+        parts = list(pool.map(score, bounds))
+    metrics = parts[0] if parts else StreamingMetrics(model.classes_)
+    for part in parts[1:]:
+        metrics.merge(part)
+
+    report_dict = metrics.report()
+    acc = report_dict["accuracy"]
+    cm = metrics.confusion
+    if verbose:
+        print("Accuracy: ", round(acc, 4))
+        print("Classification Report:\n", format_report(report_dict))
+        print("Confusion Matrix:\n", cm)
+    return acc, report_dict, cm
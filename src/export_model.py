@@ -0,0 +1,182 @@
+import json
+
+import numpy as np
+
+from compiled_model import FORMAT_VERSION
+
+# Turns a bundle written by save_model into the compact .npz artifact read by compiled_model.
+
+
+def _split_pipeline(model):
+    if hasattr(model, "steps"):
+        return model.steps[0][1] if len(model.steps) > 1 else None, model.steps[-1][1]
+    return None, model
+
+
+def _positions(preprocessor, cols, n_features):
+    cols = list(cols) if not isinstance(cols, slice) else list(range(n_features))[cols]
+    names = getattr(preprocessor, "feature_names_in_", None)
+    if names is not None and cols and not isinstance(cols[0], (int, np.integer)):
+        lookup = {name: i for i, name in enumerate(names)}
+        return [lookup[c] for c in cols]
+    if cols and isinstance(cols[0], (bool, np.bool_)):
+        return [i for i, keep in enumerate(cols) if keep]
+    return [int(c) for c in cols]
+
+
+def _export_preprocessor(preprocessor, n_features, arrays):
+    steps = []
+    if preprocessor is None:
+        return steps
+    for i, (name, transformer, cols) in enumerate(preprocessor.transformers_):
+        if transformer == "drop":
+            continue
+        positions = _positions(preprocessor, cols, n_features)
+        if not positions:
+            continue
+        kind = type(transformer).__name__
+        if transformer == "passthrough":
+            steps.append({"kind": "passthrough", "columns": positions})
+        elif kind == "StandardScaler":
+            n = len(positions)
+            mean = transformer.mean_ if transformer.with_mean else np.zeros(n)
+            scale = transformer.scale_ if transformer.with_std else np.ones(n)
+            arrays[f"pre{len(steps)}_mean"] = np.asarray(mean, dtype=np.float64)
+            arrays[f"pre{len(steps)}_scale"] = np.asarray(scale, dtype=np.float64)
+            steps.append({"kind": "scale", "columns": positions})
+        elif kind == "OneHotEncoder":
+            for j, cats in enumerate(transformer.categories_):
+                arrays[f"pre{len(steps)}_cats{j}"] = np.asarray(cats, dtype=np.float64)
+            steps.append({"kind": "onehot", "columns": positions})
+        else:
+            raise ValueError(f"Cannot compile preprocessing step '{name}' ({kind})")
+    return steps
+
+
+def _pack_trees(trees, arrays, node_fields):
+    # Concatenates per-tree node arrays and rewrites child indices to global offsets
+    roots, offset, max_depth = [], 0, 0
+    packed = {k: [] for k in node_fields}
+    for tree, depth in trees:
+        n = len(tree["left"])
+        roots.append(offset)
+        for k in node_fields:
+            values = np.asarray(tree[k])
+            if k in ("left", "right", "missing"):
+                values = np.where(values >= 0, values + offset, -1)
+            packed[k].append(values)
+        offset += n
+        max_depth = max(max_depth, depth)
+    for k, parts in packed.items():
+        arrays[k] = np.concatenate(parts)
+    arrays["roots"] = np.asarray(roots, dtype=np.int64)
+    return max_depth
+
+
+def _export_forest(clf, arrays):
+    trees = []
+    for est in clf.estimators_:
+        t = est.tree_
+        value = t.value[:, 0, :]
+        value = value / value.sum(axis=1, keepdims=True)
+        trees.append(({
+            "left": t.children_left, "right": t.children_right,
+            "feature": t.feature, "threshold": t.threshold, "value": value,
+        }, t.max_depth))
+    depth = _pack_trees(trees, arrays, ["left", "right", "feature", "threshold", "value"])
+    return {"kind": "forest", "max_depth": depth}
+
+
+def _export_xgboost(clf, arrays):
+    booster = clf.get_booster()
+    names = booster.feature_names or []
+    name_index = {n: i for i, n in enumerate(names)}
+    dumps = booster.get_dump(dump_format="json")
+
+    # Only keep the trees predict_proba would use after early stopping
+    try:
+        best = clf.best_iteration
+        per_round = max(1, len(dumps) // max(1, booster.num_boosted_rounds()))
+        dumps = dumps[:(best + 1) * per_round]
+    except AttributeError:
+        pass
+
+    trees = []
+    for dump in dumps:
+        nodes = {}
+        stack = [(json.loads(dump), 0)]
+        depth = 0
+        while stack:
+            node, d = stack.pop()
+            nodes[node["nodeid"]] = node
+            depth = max(depth, d)
+            stack.extend((child, d + 1) for child in node.get("children", []))
+        n = max(nodes) + 1
+        tree = {k: np.full(n, -1, dtype=np.int64) for k in ("left", "right", "missing", "feature")}
+        tree["threshold"] = np.zeros(n, dtype=np.float32)
+        tree["leaf"] = np.zeros(n, dtype=np.float64)
+        for nid, node in nodes.items():
+            if "leaf" in node:
+                tree["leaf"][nid] = node["leaf"]
+                continue
+            split = node["split"]
+            tree["feature"][nid] = name_index[split] if split in name_index else int(split.lstrip("f"))
+            tree["threshold"][nid] = node["split_condition"]
+            tree["left"][nid], tree["right"][nid] = node["yes"], node["no"]
+            tree["missing"][nid] = node["missing"]
+        trees.append((tree, depth))
+
+    depth = _pack_trees(trees, arrays, ["left", "right", "missing", "feature", "threshold", "leaf"])
+    config = json.loads(booster.save_config())
+    base_score = float(str(config["learner"]["learner_model_param"]["base_score"]).strip("[]"))
+    return {"kind": "xgboost", "max_depth": depth, "base_margin": float(np.log(base_score / (1 - base_score)))}
+
+
+def _export_svm(clf, arrays):
+    if clf.kernel != "rbf" or not getattr(clf, "probability", False):
+        raise ValueError("Only RBF SVMs trained with probability=True can be compiled")
+    arrays["support_vectors"] = np.asarray(clf.support_vectors_, dtype=np.float64)
+    # Raw libsvm coefficients, before sklearn flips their sign for binary problems
+    arrays["dual_coef"] = np.asarray(clf._dual_coef_[0], dtype=np.float64)
+    return {
+        "kind": "svm",
+        "gamma": float(clf._gamma),
+        "intercept": float(clf._intercept_[0]),
+        "prob_a": float(clf.probA_[0]),
+        "prob_b": float(clf.probB_[0]),
+    }
+
+
+def export_compiled_model(model, scaler, label_encoders, output_file, features=None):
+    preprocessor, clf = _split_pipeline(model)
+    if len(clf.classes_) != 2:
+        raise ValueError("Only binary classifiers can be compiled")
+
+    arrays = {}
+    columns = [str(c) for c in scaler.feature_names_in_] if hasattr(scaler, "feature_names_in_") \
+        else [str(i) for i in range(scaler.n_features_in_)]
+    arrays["scaler_mean"] = np.asarray(scaler.mean_ if scaler.with_mean else np.zeros(len(columns)), dtype=np.float64)
+    arrays["scaler_scale"] = np.asarray(scaler.scale_ if scaler.with_std else np.ones(len(columns)), dtype=np.float64)
+
+    kind = type(clf).__name__
+    if kind in ("RandomForestClassifier", "ExtraTreesClassifier"):
+        model_meta = _export_forest(clf, arrays)
+    elif kind in ("XGBClassifier", "BoosterClassifier"):
+        model_meta = _export_xgboost(clf, arrays)
+    elif kind == "SVC":
+        model_meta = _export_svm(clf, arrays)
+    else:
+        raise ValueError(f"Cannot compile model of type {kind}")
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "columns": columns,
+        "features": features.to_dict() if features is not None else None,
+        "encoders": {col: [str(c) for c in le.classes_] for col, le in label_encoders.items()},
+        "preprocessor": _export_preprocessor(preprocessor, len(columns), arrays),
+        "classes": [int(c) for c in clf.classes_],
+        "model": model_meta,
+    }
+    np.savez_compressed(output_file, meta=np.array(json.dumps(meta)), **arrays)
+    print(f"Compiled model saved to {output_file}")
+    return output_file
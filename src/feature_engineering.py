@@ -0,0 +1,68 @@
+import numpy as np
+
+# Derived features, declared once and shared by training (preprocess_data), batch/HTTP
+# inference (transform_features) and the compiled model. Each entry is
+# (name, op, left column, right column) and is computed on the label-encoded, unscaled inputs.
+FEATURES = [
+    ("Rainfall_Humidity", "mul", "Rainfall", "Humidity"),
+    ("Temp_Elevation", "mul", "Temperature", "Elevation"),
+    ("Discharge_Level", "mul", "River Discharge", "Water Level"),
+    ("Rainfall_to_Elevation", "ratio", "Rainfall", "Elevation"),
+]
+
+
+def _mul(a, b, out):
+    return np.multiply(a, b, out=out)
+
+
+def _ratio(a, b, out):
+    # a / (b + 1), written into out without temporaries
+    np.add(b, 1.0, out=out)
+    return np.divide(a, out, out=out)
+
+
+OPS = {"mul": _mul, "ratio": _ratio}
+
+
+def compute_features(inputs, specs, out=None):
+    # inputs: (n_rows, n_inputs) float array whose columns line up with specs' column indices
+    n = inputs.shape[0]
+    if out is None:
+        out = np.empty((n, len(specs)), dtype=np.float64)
+    for j, (_, op, left, right) in enumerate(specs):
+        OPS[op](inputs[:, left], inputs[:, right], out[:, j])
+    return out
+
+
+class FeatureEngineer:
+    def __init__(self, features=None):
+        self.features = list(FEATURES if features is None else features)
+
+    def fit(self, X):
+        # Keeps the features whose input columns are present
+        self.input_columns_ = [str(c) for c in X.columns]
+        index = {c: i for i, c in enumerate(self.input_columns_)}
+        self.specs_ = [(name, op, index[left], index[right]) for name, op, left, right in self.features
+                       if left in index and right in index and name not in index]
+        self.output_columns_ = self.input_columns_ + [name for name, _, _, _ in self.specs_]
+        return self
+
+    def transform_array(self, X):
+        # One preallocated output array: inputs first, derived features written in place after them
+        X = np.asarray(X, dtype=np.float64)
+        n_in = len(self.input_columns_)
+        out = np.empty((X.shape[0], n_in + len(self.specs_)), dtype=np.float64)
+        out[:, :n_in] = X
+        compute_features(out[:, :n_in], self.specs_, out=out[:, n_in:])
+        return out
+
+    def transform(self, X):
+        import pandas as pd
+        out = self.transform_array(X[self.input_columns_].to_numpy(dtype=np.float64))
+        return pd.DataFrame(out, columns=self.output_columns_, index=X.index, copy=False)
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
+
+    def to_dict(self):
+        return {"input_columns": self.input_columns_, "specs": [list(s) for s in self.specs_]}
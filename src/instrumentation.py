@@ -0,0 +1,117 @@
+import cProfile
+import functools
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Per-stage wall time, CPU time and peak memory for the training pipeline:
+#   with stage("fit"):
+#       model.fit(X, y)
+# or @instrumented("evaluate") on a function. Stages recorded in this process are read back with
+# stages() and go into the training log as metrics["stages"].
+#
+# cpu_s is process CPU time, so it counts every thread (BLAS, OpenMP, xgboost) but not separate
+# worker processes. peak_mb is the tracemalloc peak above the memory in use when the stage started;
+# NumPy reports its buffers to tracemalloc, native libraries that allocate on their own don't: libsvm,
+# xgboost and sklearn's tree builders work outside it, so the "fit" peaks understate real memory use
+# (compare with the process RSS when that matters).
+# Memory tracking is off until configure(memory=True) because tracemalloc slows down allocation-heavy
+# code, timing is always on and costs two clock reads per stage.
+# With a profile directory configured, top-level stages run under cProfile and the slowest one is
+# written as a pstats file (snakeviz / gprof2dot / python -m pstats).
+
+_config = {"memory": False, "profile_dir": None}
+_records = {}
+_stack = []
+_slowest = {"wall_s": -1.0, "name": None, "profile": None}
+
+
+def configure(memory=False, profile_dir=None):
+    _config["memory"] = memory
+    _config["profile_dir"] = profile_dir
+
+
+def reset():
+    _records.clear()
+    _slowest.update(wall_s=-1.0, name=None, profile=None)
+
+
+def stages():
+    return {name: dict(rec) for name, rec in _records.items()}
+
+
+@contextmanager
+def stage(name):
+    track_memory = _config["memory"]
+    if track_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        current, peak = tracemalloc.get_traced_memory()
+        # The enclosing stages keep their own peak across the reset below
+        for frame in _stack:
+            frame["peak"] = max(frame["peak"], peak)
+        tracemalloc.reset_peak()
+    else:
+        current = 0
+    frame = {"start": current, "peak": current}
+
+    profiler = None
+    if _config["profile_dir"] and not _stack:
+        # cProfile can't nest, so only the outermost stage is profiled
+        profiler = cProfile.Profile()
+    _stack.append(frame)
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        _stack.pop()
+
+        rec = _records.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "peak_mb": 0.0, "calls": 0})
+        rec["wall_s"] += wall
+        rec["cpu_s"] += cpu
+        rec["calls"] += 1
+        if track_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            frame["peak"] = max(frame["peak"], peak)
+            for parent in _stack:
+                parent["peak"] = max(parent["peak"], frame["peak"])
+            rec["peak_mb"] = max(rec["peak_mb"], (frame["peak"] - frame["start"]) / 1024 ** 2)
+
+        if profiler is not None and wall > _slowest["wall_s"]:
+            _slowest.update(wall_s=wall, name=name, profile=profiler)
+
+
+def instrumented(name=None):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name or fn.__name__):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def dump_slowest(prefix=""):
+    # Writes the cProfile stats of the slowest top-level stage, returns the path (None if not profiling)
+    if _slowest["profile"] is None:
+        return None
+    os.makedirs(_config["profile_dir"], exist_ok=True)
+    path = os.path.join(_config["profile_dir"], f"{prefix}{_slowest['name']}.prof".replace(" ", "_"))
+    _slowest["profile"].dump_stats(path)
+    print(f"Profile of slowest stage '{_slowest['name']}' ({_slowest['wall_s']:.1f}s) written to {path}")
+    return path
+
+
+def format_stages(records=None):
+    records = stages() if records is None else records
+    lines = [f"{'stage':<20} {'wall s':>9} {'cpu s':>9} {'peak MB':>9}"]
+    for name, rec in records.items():
+        lines.append(f"{name:<20} {rec['wall_s']:9.2f} {rec['cpu_s']:9.2f} {rec['peak_mb']:9.1f}")
+    return "\n".join(lines)
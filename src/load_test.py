@@ -0,0 +1,92 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+SERVE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "serve.py")
+
+
+def wait_until_up(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"{url}/health", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+def post_row(url, row):
+    req = urllib.request.Request(
+        f"{url}/predict", data=json.dumps(row).encode(), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        resp.read()
+
+
+def run_load(url, rows, concurrency):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda r: post_row(url, r), rows))
+    elapsed = time.perf_counter() - start
+    with urllib.request.urlopen(f"{url}/metrics") as resp:
+        metrics = json.load(resp)
+    return len(rows) / elapsed, metrics
+
+
+def start_server(model, port, max_batch_size, max_wait_ms):
+    proc = subprocess.Popen([
+        sys.executable, SERVE, "--model", model, "--port", str(port),
+        "--max-batch-size", str(max_batch_size), "--max-wait-ms", str(max_wait_ms),
+    ])
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_up(url)
+    except RuntimeError:
+        proc.terminate()
+        raise
+    return proc, url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare micro-batched vs per-request scoring throughput.")
+    parser.add_argument("--model", default=None, help="Bundle path (default: current model in the artifact store)")
+    parser.add_argument("--data", default="data/flood_risk_dataset_india.csv")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    if args.model is None:
+        from artifact_store import resolve
+        args.model = resolve()
+
+    df = pd.read_csv(args.data, nrows=args.requests).drop(columns=["Flood Occurred"], errors="ignore").dropna()
+    rows = json.loads(df.to_json(orient="records"))
+
+    results = {}
+    # max_batch_size=1 disables batching, so every request is its own predict_proba call
+    for label, batch_size in (("per-request", 1), ("micro-batched", args.max_batch_size)):
+        proc, url = start_server(args.model, args.port, batch_size, args.max_wait_ms)
+        try:
+            rate, metrics = run_load(url, rows, args.concurrency)
+        finally:
+            proc.terminate()
+            proc.wait()
+        results[label] = rate
+        print(f"{label:>14}: {rate:,.0f} rows/sec, mean latency {metrics['latency_ms']['mean']:.1f} ms, "
+              f"mean batch {metrics['batch_size']['mean']:.1f} rows")
+
+    print(f"Speedup from micro-batching: {results['micro-batched'] / results['per-request']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,109 @@
-import pandas as pd
-import os
+import argparse
+import csv
 import datetime
+import json
+import os
+import sqlite3
+
+try:
+    import fcntl
+except ImportError:  # Windows, CSV appends are unlocked there
+    fcntl = None
+
+# Runs are stored in SQLite (WAL mode) next to the CSV, e.g. training_logs.csv -> training_logs.db.
+# SQLite hands out RunIDs atomically, so parallel training jobs never collide, and the CSV only
+# gets one appended line per run instead of being re-read and rewritten.
+_BASE_CSV_COLUMNS = [
+    "RunID", "Timestamp", "Model", "Accuracy", "Precision", "Recall", "F1-score",
+    "Train Size", "Test Size", "Parameters", "Notes"
+]
+# Size / latency figures from metrics (model_stats.model_profile), blank for runs that didn't record them
+_METRIC_COLUMNS = {
+    "Train Seconds": "train_seconds",
+    "Model Bytes": "model_bytes",
+    "Predict p50 ms": "predict_p50_ms",
+    "Predict p99 ms": "predict_p99_ms",
+}
+CSV_COLUMNS = _BASE_CSV_COLUMNS + list(_METRIC_COLUMNS)
+_DB_COLUMNS = [
+    "run_id", "timestamp", "model", "accuracy", "precision", "recall", "f1",
+    "train_size", "test_size", "parameters", "notes"
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    model TEXT NOT NULL,
+    accuracy REAL,
+    precision REAL,
+    recall REAL,
+    f1 REAL,
+    train_size INTEGER,
+    test_size INTEGER,
+    parameters TEXT,
+    notes TEXT,
+    metrics TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_model ON runs(model, timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs(timestamp);
+"""
+
+
+def db_path_for(filename):
+    return os.path.splitext(filename)[0] + ".db"
+
+
+def _connect(db_path, csv_file=None):
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+
+    # First use next to an existing CSV: import its history so RunIDs carry on from it
+    if csv_file and os.path.exists(csv_file):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 0:
+                with open(csv_file, newline="") as fh:
+                    rows = [[r.get(c) or None for c in _BASE_CSV_COLUMNS] for r in csv.DictReader(fh)]
+                conn.executemany(
+                    f"INSERT INTO runs ({', '.join(_DB_COLUMNS)}) VALUES ({', '.join('?' * len(_DB_COLUMNS))})", rows
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return conn
+
+
+def _metric_values(metrics):
+    metrics = metrics or {}
+    return ["" if metrics.get(key) is None else metrics[key] for key in _METRIC_COLUMNS.values()]
+
+
+def _csv_header(filename):
+    if not os.path.exists(filename):
+        return None
+    with open(filename, newline="") as fh:
+        return next(csv.reader(fh), None)
+
+
+def _append_csv(filename, row):
+    with open(filename, "a", newline="") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            fh.seek(0, os.SEEK_END)
+            writer = csv.writer(fh)
+            if fh.tell() == 0:
+                writer.writerow(CSV_COLUMNS)
+            writer.writerow(row)
+            fh.flush()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
 
 def log_results_csv(
     filename: str = "training_logs.csv",
@@ -10,7 +113,8 @@ def log_results_csv(
     train_size: int = 0,
     test_size: int = 0,
     params: dict = None,
-    notes: str = ""
+    notes: str = "",
+    metrics: dict = None
 ):
 
     if report is None:
@@ -25,9 +129,12 @@ def log_results_csv(
     # For getting the Timestamp
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # To Create new row
-    new_entry = pd.DataFrame([[
-        None,    
+    # Ensure directory exists if a path is provided
+    dirpart = os.path.dirname(filename)
+    if dirpart and not os.path.exists(dirpart):
+        os.makedirs(dirpart, exist_ok=True)
+
+    values = [
         timestamp,
         model_name,
         float(acc),
@@ -38,24 +145,97 @@ def log_results_csv(
         int(test_size),
         str(params) if params is not None else "",
         notes
-    ]], columns=[
-        "RunID","Timestamp","Model","Accuracy","Precision","Recall","F1-score",
-        "Train Size","Test Size","Parameters","Notes"
-    ])
+    ]
 
-    # Ensure directory exists if a path is provided
-    dirpart = os.path.dirname(filename)
-    if dirpart and not os.path.exists(dirpart):
-        os.makedirs(dirpart, exist_ok=True)
+    # RunID comes from SQLite's AUTOINCREMENT inside the insert, so concurrent runs can't race
+    conn = _connect(db_path_for(filename), csv_file=filename)
+    try:
+        cur = conn.execute(
+            f"INSERT INTO runs ({', '.join(_DB_COLUMNS[1:])}, metrics) VALUES ({', '.join('?' * len(_DB_COLUMNS))})",
+            values + [json.dumps(metrics, default=str) if metrics else None]
+        )
+        run_id = cur.lastrowid
+    finally:
+        conn.close()
 
-    # Appending or creating
-    if os.path.exists(filename):
-        old = pd.read_csv(filename)
-        new_entry["RunID"] = len(old) + 1
-        final = pd.concat([old, new_entry], ignore_index=True)
+    if _csv_header(filename) in (None, CSV_COLUMNS):
+        _append_csv(filename, [run_id] + values + _metric_values(metrics))
     else:
-        new_entry["RunID"] = 1
-        final = new_entry
+        # Log written before the size / latency columns existed: rewrite it from the database once
+        export_csv(filename)
+    print(f"Logged run #{run_id} to {filename}")
+    return run_id
+
+
+def query_runs(filename="training_logs.csv", model=None, since=None, until=None, limit=None, run_id=None):
+    # Uses the (model, timestamp) / timestamp indexes; since/until are "YYYY-MM-DD[ HH:MM:SS]" strings
+    clauses, args = [], []
+    if run_id is not None:
+        clauses.append("run_id = ?")
+        args.append(int(run_id))
+    if model is not None:
+        clauses.append("model = ?")
+        args.append(model)
+    if since is not None:
+        clauses.append("timestamp >= ?")
+        args.append(since)
+    if until is not None:
+        clauses.append("timestamp <= ?")
+        args.append(until)
+    sql = "SELECT * FROM runs"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY run_id"
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+
+    conn = _connect(db_path_for(filename), csv_file=filename)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = [dict(r) for r in conn.execute(sql, args)]
+    finally:
+        conn.close()
+    for r in rows:
+        r["metrics"] = json.loads(r["metrics"]) if r["metrics"] else {}
+    return rows
+
+
+def export_csv(filename="training_logs.csv", output=None):
+    # Compaction: rewrites the CSV from the database in RunID order, atomically
+    output = output or filename
+    conn = _connect(db_path_for(filename), csv_file=filename)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        rows = conn.execute(f"SELECT {', '.join(_DB_COLUMNS)}, metrics FROM runs ORDER BY run_id").fetchall()
+    finally:
+        conn.close()
+
+    tmp = f"{output}.tmp"
+    with open(tmp, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerows(["" if v is None else v for v in row[:-1]] + _metric_values(json.loads(row[-1] or "{}"))
+                         for row in rows)
+    os.replace(tmp, output)
+    print(f"Exported {len(rows)} runs to {output}")
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or export the training log.")
+    parser.add_argument("command", choices=["query", "export"])
+    parser.add_argument("--log", default="training_logs.csv")
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--since", default=None)
+    parser.add_argument("--output", default=None, help="CSV path for export (default: rewrite --log)")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export_csv(args.log, args.output)
+        return
+    for r in query_runs(args.log, model=args.model, since=args.since):
+        print(f"#{r['run_id']:<4} {r['timestamp']}  {r['model']:<25} acc={r['accuracy']:.4f} f1={r['f1']:.4f}  {r['notes']}")
+
 
-    final.to_csv(filename, index=False)
-    print(f"Logged run #{int(new_entry['RunID'].iloc[0])} to {filename}")
+if __name__ == "__main__":
+    main()
@@ -1,58 +1,181 @@
-from preprocessing_script import load_data, preprocess_data
-from randomforest_model import train_random_forest, evaluate_model as eval_rf
-from svm_model import train_svm, evaluate_model as eval_svm
+import argparse
+import importlib
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from preprocessing_script import load_and_preprocess
 from logs import log_results_csv
-from randomforest_model import save_model
-from xgboost_model import train_xgboost, evaluate_model as eval_xgb
+import artifact_store
+from export_model import export_compiled_model
+from model_stats import model_profile
+import instrumentation
+from instrumentation import stage
+
+# key: (module, train function, notes for the training log; a dict picks them by the "mode" option)
+MODELS = {
+    "rf": ("randomforest_model", "train_random_forest", {
+        "baseline": "Baseline RF Model",
+        "fast": "Depth-limited RF trained on all cores",
+        "hist": "Histogram-based gradient boosting",
+    }),
+    "svm": ("svm_model", "train_svm", "SVM with RBF kernel"),
+    "xgb": ("xgboost_model", "train_xgboost", "XGBoost with feature engineering"),
+}
+
+# Arrays shared read-only with the worker processes (memory-mapped from disk)
+_shared = {}
+
+
+def _init_worker(array_dir, cores, memory=False, profile_dir=None):
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(cores)
+    instrumentation.configure(memory=memory, profile_dir=profile_dir)
+    for name in ("X_train", "X_test", "y_train", "y_test"):
+        _shared[name] = np.load(os.path.join(array_dir, f"{name}.npy"), mmap_mode="r")
+
+
+def train_one(key, n_jobs=None, options=None):
+    module_name, train_fn, notes = MODELS[key]
+    if isinstance(notes, dict):
+        notes = notes[(options or {}).get("mode", "baseline")]
+    module = importlib.import_module(module_name)
+    # Worker processes are reused, stages are per model
+    instrumentation.reset()
+
+    start = time.perf_counter()
+    model, model_name = getattr(module, train_fn)(_shared["X_train"], _shared["y_train"], n_jobs=n_jobs,
+                                                  **(options or {}))
+    train_seconds = time.perf_counter() - start
+
+    with stage("evaluate"):
+        acc, report_dict, cm = module.evaluate_model(model, _shared["X_test"], _shared["y_test"])
+    total_seconds = time.perf_counter() - start
+    with stage("model_profile"):
+        profile = model_profile(model, _shared["X_test"])
+    metrics = {"train_seconds": train_seconds, "roc_auc": report_dict.get("roc_auc"),
+               "calibration": report_dict.get("calibration"), **profile, "stages": instrumentation.stages()}
+    instrumentation.dump_slowest(prefix=f"{key}_")
+    return {
+        "key": key, "model": model, "model_name": model_name, "notes": notes,
+        "acc": acc, "report": report_dict, "cm": cm, "metrics": metrics,
+        "train_seconds": train_seconds, "total_seconds": total_seconds,
+    }
+
+
+def save_and_log(result, scaler, encoders, features, train_size, test_size, log_file="training_logs.csv"):
+    instrumentation.reset()
+    with stage("save"):
+        version_dir = artifact_store.publish(result["model"], scaler, encoders, result["model_name"], features=features)
+        # Dependency-light copy for compiled_model.CompiledModel
+        try:
+            export_compiled_model(result["model"], scaler, encoders, os.path.join(version_dir, "model.npz"),
+                                  features=features)
+        except ValueError as e:
+            print(f"Skipping compiled export: {e}")
+
+    # Stage timings end up as metrics["stages"] next to the preprocessing ones passed in by main
+    metrics = dict(result["metrics"])
+    metrics["stages"] = {**metrics.get("stages", {}), **instrumentation.stages()}
+    run_id = log_results_csv(
+        filename=log_file,
+        model_name=result["model_name"],
+        acc=result["acc"],
+        report=result["report"],
+        train_size=train_size,
+        test_size=test_size,
+        params=getattr(result["model"], "search_report_", None),
+        notes=result["notes"],
+        metrics=metrics
+    )
+    artifact_store.record_run(version_dir, run_id, log_file)
+    return version_dir
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Train flood prediction models in parallel.")
+    parser.add_argument("--data", default="data/flood_risk_dataset_india.csv")
+    parser.add_argument("--models", nargs="+", choices=sorted(MODELS), default=sorted(MODELS))
+    parser.add_argument("--cores-per-model", type=int, default=None,
+                        help="CPU budget for each model (default: cores split evenly across models)")
+    parser.add_argument("--xgb-search", choices=["grid", "halving", "bayes"], default="grid",
+                        help="Hyperparameter search used by train_xgboost")
+    parser.add_argument("--rf-mode", choices=["baseline", "fast", "hist"], default="baseline",
+                        help="Original forest, depth-limited parallel forest, or histogram gradient boosting")
+    parser.add_argument("--rf-size-budget-mb", type=float, default=None,
+                        help="Trim the forest until the pickled model fits this size")
+    parser.add_argument("--svm-mode", choices=["exact", "nystroem", "rff"], default="exact",
+                        help="Exact RBF SVC or a kernel approximation with a linear SVM")
+    parser.add_argument("--rebalance", choices=["smote", "weights", "undersample", "smote_approx"], default="smote",
+                        help="Class rebalancing used by every model (see rebalance.py)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the preprocessing cache")
+    parser.add_argument("--xgb-trials", type=int, default=30, help="Trials for --xgb-search bayes")
+    parser.add_argument("--memory", action="store_true",
+                        help="Track tracemalloc peak memory per stage (slower, misses native allocations)")
+    parser.add_argument("--no-promote", action="store_true",
+                        help="Don't make the most accurate model of this run the store-wide current model")
+    parser.add_argument("--profile-dir", default=None,
+                        help="cProfile the stages and write the slowest one per process here as .prof")
+    args = parser.parse_args()
+    instrumentation.configure(memory=args.memory, profile_dir=args.profile_dir)
+
     print("-------------------------Started-----------------------")
-    file_path = "data/flood_risk_dataset_india.csv"
-    print("Loading and Cleaning the data.")
-    df = load_data(file_path)
-
-    print(df['Flood Occurred'].value_counts(normalize=True))
-
-    print("Processing data (Encoding + Scaling + Train-Test Split)")
-    X_train, X_test, y_train, y_test, scaler, encoders = preprocess_data(df)
-    
-    ########## MODEL SELECTION ##########
-    
-    # ======= Random Forest =======
-    # model, model_name = train_random_forest(X_train, y_train)
-    # acc, report_dict, cm = eval_rf(model, X_test, y_test)
-    # notes = "Baseline RF Model"
-
-    # ======= Support Vector Machine =======
-    #model, model_name = train_svm(X_train, y_train)
-    #acc, report_dict, cm = eval_svm(model, X_test, y_test)
-    #notes = "SVM with RBF kernel"
-
-    # ======= XGBoost =======
-    model, model_name = train_xgboost(X_train, y_train)
-    # Re-load original dataframe for X_test, because your pipeline handles raw data
-    df = load_data(file_path)
-    _, X_test_raw, _, y_test, _, _ = preprocess_data(df)
-
-    acc, report_dict, cm = eval_xgb(model, X_test_raw, y_test)
-
-    notes = "XGBoost with feature engineering"
-
-
-    ########## LOGGING + SAVING ##########
-    log_results_csv(
-        filename="training_logs.csv",
-        model_name=model_name,
-        acc=acc,
-        report=report_dict,
-        train_size=len(y_train),
-        test_size=len(y_test),
-        notes=notes
-    )
+    overall_start = time.perf_counter()
+    # Preprocessing once, every model trains on the same split
+    print("Loading and Processing data (Encoding + Feature Engineering + Scaling + Train-Test Split)")
+    X_train, X_test, y_train, y_test, scaler, encoders, features = load_and_preprocess(args.data, use_cache=not args.no_cache)
+
+    print(pd.Series(np.concatenate([y_train, y_test])).value_counts(normalize=True))
+    prep_stages = instrumentation.stages()
+    print(instrumentation.format_stages(prep_stages))
+    instrumentation.dump_slowest(prefix="preprocess_")
+
+    cores = args.cores_per_model or max(1, (os.cpu_count() or 1) // len(args.models))
+    print(f"Training {', '.join(args.models)} in parallel with {cores} core(s) each")
+
+    with tempfile.TemporaryDirectory(prefix="flood_train_") as array_dir:
+        for name, arr in (("X_train", X_train), ("X_test", X_test), ("y_train", y_train), ("y_test", y_test)):
+            np.save(os.path.join(array_dir, f"{name}.npy"), np.asarray(arr))
+
+        timings = {}
+        with ProcessPoolExecutor(max_workers=len(args.models), initializer=_init_worker,
+                                 initargs=(array_dir, cores, args.memory, args.profile_dir)) as pool:
+            options = {
+                "xgb": {"search": args.xgb_search, "n_iter": args.xgb_trials},
+                "svm": {"mode": args.svm_mode},
+                "rf": {"mode": args.rf_mode, "size_budget_mb": args.rf_size_budget_mb},
+            }
+            for opts in options.values():
+                opts["rebalance_mode"] = args.rebalance
+            futures = {pool.submit(train_one, key, cores, options.get(key)): key for key in args.models}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Error training {key}: {e}")
+                    continue
+                result["metrics"]["stages"] = {**prep_stages, **result["metrics"]["stages"]}
+                save_and_log(result, scaler, encoders, features, len(y_train), len(y_test))
+                timings[result["model_name"]] = (result["train_seconds"], result["total_seconds"], result["acc"],
+                                                  result["metrics"])
+
+    if timings and not args.no_promote:
+        best = max(timings, key=lambda name: timings[name][2])
+        version = artifact_store.set_current(best)
+        print(f"Current model: {artifact_store.slug(best)}/{version}")
+
+    print("-------------------------Summary-----------------------")
+    for model_name, (train_s, total_s, acc, m) in timings.items():
+        print(f"{model_name:<25} train {train_s:8.1f}s | train+eval {total_s:8.1f}s | accuracy {acc:.4f} | "
+              f"{m['model_bytes'] / 1024 ** 2:6.2f} MB | p50 {m['predict_p50_ms']:.2f} ms | p99 {m['predict_p99_ms']:.2f} ms")
+        print(instrumentation.format_stages(m["stages"]))
+    print(f"Overall wall-clock: {time.perf_counter() - overall_start:.1f}s. Logged to training_logs.csv")
 
-    save_model(model, scaler, encoders, model_file=f"{model_name.replace(' ', '_')}_model.pkl")
-    print(f"Run completed. Accuracy: {acc:.4f}. Logged to training_logs.csv")
 
 if __name__ == "__main__":
     try:
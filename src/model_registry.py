@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+
+# Process-wide cache of the bundles written by randomforest_model.save_model / artifact_store.publish.
+# Entries are keyed by absolute path, file mtime and mmap_mode, so a retrained bundle written to the
+# same path is picked up on the next call without restarting the process.
+# Without a path, the store-wide current model of artifact_store is used, so promoting a new version
+# switches every caller over. That model has a single "current" slot: loading a newly promoted version
+# replaces the previous one instead of keeping every version ever served in memory.
+# Bundles are opened with mmap_mode="r": the NumPy arrays of an uncompressed bundle are mapped instead of
+# copied and shared between scoring processes through the page cache (see load_bundle for the exceptions).
+_cache = {}
+_lock = threading.Lock()
+_stats = {"loads": 0, "hits": 0, "load_seconds": 0.0}
+_CURRENT = "current"
+
+
+def _cache_key(model_file, mmap_mode):
+    path = os.path.abspath(model_file)
+    return path, os.stat(path).st_mtime_ns, mmap_mode
+
+
+def _estimators(model):
+    yield model
+    for _, step in getattr(model, "steps", []):
+        yield from _estimators(step)
+
+
+def load_bundle(path, mmap_mode="r"):
+    bundle = joblib.load(path, mmap_mode=mmap_mode)
+    # libsvm's predict_proba writes into the SVC arrays and raises on read-only maps, so SVMs get private
+    # copies. Forests and XGBoost copy their arrays on unpickle anyway; scalers and linear models stay mapped.
+    for est in _estimators(bundle["model"]):
+        if hasattr(est, "support_vectors_"):
+            for name, value in vars(est).items():
+                if isinstance(value, np.ndarray) and not value.flags.writeable:
+                    setattr(est, name, np.array(value))
+    return bundle
+
+
+def get_bundle(model_file=None, mmap_mode="r"):
+    slot = None
+    if model_file is None:
+        from artifact_store import resolve
+        model_file, slot = resolve(), _CURRENT
+    key = _cache_key(model_file, mmap_mode)
+    path = key[0]
+
+    with _lock:
+        entry = _cache.get(slot or path)
+        if entry is not None and entry[0] == key:
+            _stats["hits"] += 1
+            return entry[1]
+
+        start = time.perf_counter()
+        bundle = load_bundle(path, mmap_mode=mmap_mode)
+        elapsed = time.perf_counter() - start
+
+        # Replacing the old entry (same path, or the previous current version) drops the stale bundle
+        _cache[slot or path] = (key, bundle)
+        _stats["loads"] += 1
+        _stats["load_seconds"] += elapsed
+        print(f"Loaded {path} in {elapsed:.3f}s")
+        return bundle
+
+
+def get_model(model_file=None):
+    bundle = get_bundle(model_file)
+    return bundle["model"], bundle["scaler"], bundle["encoders"]
+
+
+def stats():
+    with _lock:
+        return {**_stats, "cached": len(_cache)}
+
+
+def clear():
+    with _lock:
+        _cache.clear()
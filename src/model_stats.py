@@ -0,0 +1,27 @@
+import pickle
+import time
+
+import numpy as np
+
+# Size and latency figures recorded next to accuracy in the training log
+
+
+def model_bytes(model):
+    return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def predict_latency(model, X, n_rows=200):
+    # Single-row predict_proba latency in milliseconds (p50, p99)
+    X = np.asarray(X)
+    model.predict_proba(X[:1])  # warm-up
+    times = []
+    for i in range(min(n_rows, len(X))):
+        start = time.perf_counter()
+        model.predict_proba(X[i:i + 1])
+        times.append(time.perf_counter() - start)
+    return float(np.percentile(times, 50) * 1e3), float(np.percentile(times, 99) * 1e3)
+
+
+def model_profile(model, X_sample, n_rows=200):
+    p50, p99 = predict_latency(model, X_sample, n_rows)
+    return {"model_bytes": model_bytes(model), "predict_p50_ms": p50, "predict_p99_ms": p99}
@@ -0,0 +1,65 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from preprocessing_script import transform_features
+from model_registry import get_bundle
+
+
+def predict_file(model_file, input_path, output_path, chunksize=200_000,
+                 target_col="Flood Occurred", keep_cols=("Latitude", "Longitude")):
+    bundle = get_bundle(model_file)
+    model, scaler, encoders = bundle["model"], bundle["scaler"], bundle["encoders"]
+    features = bundle.get("features")
+
+    dirpart = os.path.dirname(output_path)
+    if dirpart:
+        os.makedirs(dirpart, exist_ok=True)
+
+    total_rows = 0
+    start = time.perf_counter()
+    header = True
+
+    # Reading the input in chunks so memory stays flat regardless of file size
+    for chunk in pd.read_csv(input_path, chunksize=chunksize):
+        valid = chunk.drop(columns=[target_col], errors="ignore").notna().all(axis=1).to_numpy()
+        proba = np.full(len(chunk), np.nan)
+        if valid.any():
+            X = transform_features(chunk[valid], scaler, encoders, target_col, features)
+            proba[valid] = model.predict_proba(X)[:, 1]
+
+        out = chunk[[c for c in keep_cols if c in chunk.columns]].copy()
+        out["Flood Probability"] = proba
+        out["Prediction"] = np.where(valid, (proba >= 0.5).astype(int), -1)
+        out.to_csv(output_path, mode="w" if header else "a", header=header, index=False)
+        header = False
+
+        total_rows += len(chunk)
+        elapsed = time.perf_counter() - start
+        print(f"Scored {total_rows} rows ({total_rows / elapsed:,.0f} rows/sec)")
+
+    elapsed = time.perf_counter() - start
+    rate = total_rows / elapsed if elapsed > 0 else 0.0
+    print(f"Done. {total_rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec). Output: {output_path}")
+    return total_rows, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a CSV of locations with a saved flood model bundle.")
+    parser.add_argument("input", help="CSV with the same columns as data/flood_risk_dataset_india.csv")
+    parser.add_argument("output", help="Where to write the scored CSV")
+    parser.add_argument("--model", default=None,
+                        help="Bundle path (default: current model in the artifact store)")
+    parser.add_argument("--chunksize", type=int, default=200_000, help="Rows per prediction batch")
+    parser.add_argument("--keep", nargs="*", default=["Latitude", "Longitude"],
+                        help="Input columns to copy into the output")
+    args = parser.parse_args()
+
+    predict_file(args.model, args.input, args.output, chunksize=args.chunksize, keep_cols=args.keep)
+
+
+if __name__ == "__main__":
+    main()
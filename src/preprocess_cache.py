@@ -0,0 +1,133 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import joblib
+import numpy as np
+
+# On-disk cache for preprocess_data results, keyed by the input file contents plus the
+# preprocessing parameters. Arrays are stored as plain .npy files so they can be memory-mapped.
+CACHE_DIR = os.path.join(".cache", "preprocess")
+MAX_CACHE_BYTES = 2 * 1024 ** 3
+ARRAYS = ("X_train", "X_test", "y_train", "y_test")
+
+
+def file_digest(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    if os.path.isdir(path):
+        files = sorted(os.path.join(root, f) for root, _, names in os.walk(path) for f in names)
+    else:
+        files = [path]
+    for name in files:
+        h.update(os.path.relpath(name, path).encode() if name != path else b"")
+        with open(name, "rb") as fh:
+            for block in iter(lambda: fh.read(block_size), b""):
+                h.update(block)
+    return h.hexdigest()
+
+
+def cache_key(file_path, params):
+    h = hashlib.sha256(file_digest(file_path).encode())
+    h.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return h.hexdigest()[:32]
+
+
+def load_entry(key, cache_dir=CACHE_DIR, mmap_mode="r"):
+    entry = os.path.join(cache_dir, key)
+    if not os.path.isdir(entry):
+        return None
+    try:
+        arrays = [np.load(os.path.join(entry, f"{name}.npy"), mmap_mode=mmap_mode) for name in ARRAYS]
+        objects = joblib.load(os.path.join(entry, "objects.joblib"))
+    except (OSError, ValueError, EOFError):
+        # Half-written or corrupted entry, drop it and recompute
+        shutil.rmtree(entry, ignore_errors=True)
+        return None
+    # Touching the entry so eviction treats it as recently used
+    os.utime(entry)
+    return (*arrays, objects["scaler"], objects["encoders"], objects["features"])
+
+
+def store_entry(key, result, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    os.makedirs(cache_dir, exist_ok=True)
+    X_train, X_test, y_train, y_test, scaler, encoders, features = result
+
+    # Writing into a temp directory first so readers never see a partial entry
+    tmp = tempfile.mkdtemp(prefix=".tmp_", dir=cache_dir)
+    for name, arr in zip(ARRAYS, (X_train, X_test, y_train, y_test)):
+        np.save(os.path.join(tmp, f"{name}.npy"), np.asarray(arr))
+    joblib.dump({"scaler": scaler, "encoders": encoders, "features": features}, os.path.join(tmp, "objects.joblib"))
+
+    entry = os.path.join(cache_dir, key)
+    try:
+        os.rename(tmp, entry)
+    except OSError:
+        # Another process stored the same key first
+        shutil.rmtree(tmp, ignore_errors=True)
+    evict(cache_dir, max_bytes)
+
+
+def _entry_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, names in os.walk(path) for f in names)
+
+
+def list_entries(cache_dir=CACHE_DIR):
+    # Entries are directories here, single files in other caches sharing the eviction (rebalance.py)
+    if not os.path.isdir(cache_dir):
+        return []
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.startswith(".tmp_"):
+            path = os.path.join(cache_dir, name)
+            entries.append({"key": name, "bytes": _entry_size(path), "last_used": os.path.getmtime(path)})
+    return sorted(entries, key=lambda e: e["last_used"], reverse=True)
+
+
+def evict(cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    # Least recently used entries go first until the cache fits the size budget
+    entries = list_entries(cache_dir)
+    total = sum(e["bytes"] for e in entries)
+    while entries and total > max_bytes:
+        oldest = entries.pop()
+        path = os.path.join(cache_dir, oldest["key"])
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        total -= oldest["bytes"]
+        print(f"Evicted cache entry {oldest['key']} from {cache_dir}")
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    print(f"Cleared {cache_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the preprocessing cache.")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--clear", action="store_true", help="Delete every cached entry")
+    parser.add_argument("--max-bytes", type=int, default=None, help="Evict down to this size")
+    args = parser.parse_args()
+
+    if args.clear:
+        clear_cache(args.cache_dir)
+        return
+    if args.max_bytes is not None:
+        evict(args.cache_dir, args.max_bytes)
+    for e in list_entries(args.cache_dir):
+        used = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(e["last_used"]))
+        print(f"{e['key']}  {e['bytes'] / 1024 ** 2:8.1f} MB  last used {used}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,103 @@
+import os
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from feature_engineering import FeatureEngineer
+from instrumentation import instrumented, stage
 
+
+@instrumented("load")
 def load_data(file_path):
-    if file_path.endswith('.xlsx'):
+    if os.path.isdir(file_path):
+        # NumPy block layout written by convert_dataset.py, opened as memory maps
+        from convert_dataset import read_npy_dir
+        df = read_npy_dir(file_path)
+    elif file_path.endswith('.xlsx'):
         df = pd.read_excel(file_path)
+    elif file_path.endswith('.parquet'):
+        df = pd.read_parquet(file_path, engine="pyarrow", memory_map=True)
+    elif file_path.endswith(('.feather', '.arrow')):
+        from pyarrow import feather
+        df = feather.read_table(file_path, memory_map=True).to_pandas()
     else:
         df = pd.read_csv(file_path)
     return df
 
-def preprocess_data(df, target_col="Flood Occurred"):
+def preprocess_data(df, target_col="Flood Occurred", test_size=0.2, random_state=42, features=None):
+    # sklearn is only needed for fitting, importing this module for transform_features (app, batch scorer) skips it
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler, LabelEncoder
 
     # Droping the rows with missing values
-    df = df.dropna()
+    with stage("dropna"):
+        df = df.dropna()
 
-    X = df.drop(columns=[target_col])
-    y = df[target_col]
+        X = df.drop(columns=[target_col])
+        y = df[target_col]
 
     # Encoding the categorical features, Convrting the string/object data to Int
-    cat_cols = X.select_dtypes(include=["object"]).columns
-    label_encoders = {}
-    for col in cat_cols:
-        le = LabelEncoder()
-        X[col] = le.fit_transform(X[col])
-        label_encoders[col] = le
+    with stage("encode"):
+        cat_cols = X.select_dtypes(include=["object", "category"]).columns
+        label_encoders = {}
+        for col in cat_cols:
+            le = LabelEncoder()
+            X[col] = le.fit_transform(X[col])
+            label_encoders[col] = le
+
+    # Adding the derived features declared in feature_engineering.py, the fitted engineer goes into the bundle
+    with stage("features"):
+        feature_engineer = FeatureEngineer(features)
+        X = feature_engineer.fit_transform(X)
 
     # Scaling the numerical features (Scaling feature columns to get mean 0, standard deviation )
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
+    with stage("scale"):
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
 
     # Train-test split
-    X_train, X_test, y_train, y_test = train_test_split(
-        X_scaled, y, test_size=0.2, random_state=42, stratify=y
-    )
+    with stage("split"):
+        X_train, X_test, y_train, y_test = train_test_split(
+            X_scaled, y, test_size=test_size, random_state=random_state, stratify=y
+        )
+
+    return X_train, X_test, y_train, y_test, scaler, label_encoders, feature_engineer
+
+def load_and_preprocess(file_path, target_col="Flood Occurred", test_size=0.2, random_state=42, features=None,
+                        use_cache=True):
+    # load_data + preprocess_data, served from the on-disk cache when the file and params are unchanged
+    if not use_cache:
+        return preprocess_data(load_data(file_path), target_col, test_size, random_state, features)
+
+    import preprocess_cache
+    from feature_engineering import FEATURES
+    params = {"target_col": target_col, "test_size": test_size, "random_state": random_state,
+              "features": FEATURES if features is None else features}
+    key = preprocess_cache.cache_key(file_path, params)
+    with stage("load_cache"):
+        cached = preprocess_cache.load_entry(key)
+    if cached is not None:
+        print(f"Using cached preprocessing ({key})")
+        return cached
+
+    result = preprocess_data(load_data(file_path), target_col, test_size, random_state, features)
+    preprocess_cache.store_entry(key, result)
+    return result
+
+def transform_features(df, scaler, label_encoders, target_col="Flood Occurred", features=None):
+    # Same encoding + feature engineering + scaling as preprocess_data, using the fitted objects from a saved bundle
+    X = df.drop(columns=[target_col], errors="ignore")
+
+    # Keep the column order used in training (bundles saved before feature engineering have features=None)
+    if features is not None:
+        X = X[features.input_columns_]
+    elif hasattr(scaler, "feature_names_in_"):
+        X = X[list(scaler.feature_names_in_)]
+
+    X = X.copy()
+    for col, le in label_encoders.items():
+        if col not in X.columns or pd.api.types.is_numeric_dtype(X[col]):
+            continue
+        # Vectorized lookup against the fitted vocabulary, unseen labels become -1
+        X[col] = pd.Categorical(X[col], categories=le.classes_).codes
 
-    return X_train, X_test, y_train, y_test, scaler, label_encoders
+    if features is not None:
+        X = features.transform(X)
+    return scaler.transform(X)
@@ -1,15 +1,52 @@
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import joblib
-import matplotlib.pyplot as plt
-import pandas as pd
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
-from sklearn.pipeline import Pipeline
-from sklearn.compose import ColumnTransformer
 import numpy as np
-from imblearn.over_sampling import SMOTE
+from instrumentation import stage
+from evaluation import evaluate_model  # shared implementation, re-exported for main.py
+from rebalance import rebalance
+from model_stats import model_bytes
+
+# sklearn, imblearn and pandas are imported inside the training / evaluation functions, so
+# importing this module for save_model / load_model (main.py, out_of_core.py) stays cheap.
+
+# "baseline" is the original 200 fully grown trees, "fast" builds depth/leaf-limited trees on all
+# cores, "hist" swaps the forest for histogram-based gradient boosting (logged as "Hist Gradient Boosting").
+RF_MODES = ("baseline", "fast", "hist")
+
+
+def _fit_size_budget(model, size_budget_mb, X, y):
+    # Forest: drops trees from the end until the pickled pipeline fits the budget.
+    # Hist GB: refits with fewer boosting iterations (its trees can't be dropped through the public API)
+    rf = model.named_steps['rf']
+    budget = size_budget_mb * 1024 ** 2
+    size = model_bytes(model)
+    if not hasattr(rf, "estimators_"):
+        while size > budget and rf.n_iter_ > 1:
+            max_iter = max(1, min(rf.n_iter_ - 1, int(rf.n_iter_ * budget / size)))
+            model.set_params(rf__max_iter=max_iter)
+            with stage("fit"):
+                model.fit(X, y)
+            size = model_bytes(model)
+        print(f"Hist Gradient Boosting limited to {rf.n_iter_} iterations ({size / 1024 ** 2:.2f} MB)")
+        return model
+    while size > budget and len(rf.estimators_) > 1:
+        keep = max(1, min(len(rf.estimators_) - 1, int(len(rf.estimators_) * budget / size)))
+        rf.estimators_ = rf.estimators_[:keep]
+        rf.n_estimators = keep
+        size = model_bytes(model)
+    print(f"Random Forest trimmed to {len(rf.estimators_)} trees ({size / 1024 ** 2:.2f} MB)")
+    return model
+
+
+def train_random_forest(X, y, n_jobs=None, mode="baseline", max_depth=16, max_leaf_nodes=None, size_budget_mb=None,
+                        rebalance_mode="smote"):
+    if mode not in RF_MODES:
+        raise ValueError(f"Unknown Random Forest mode '{mode}', expected one of {RF_MODES}")
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+    from sklearn.pipeline import Pipeline
+    from sklearn.compose import ColumnTransformer
 
-def train_random_forest(X, y):
     # Converting the Columns to DataFrame if needed
     if isinstance(X, np.ndarray):
         X = pd.DataFrame(X)
@@ -18,18 +55,12 @@ def train_random_forest(X, y):
     categorical_cols = X.select_dtypes(include=['object', 'category']).columns
     numeric_cols = X.select_dtypes(include=['int64', 'float64']).columns
 
- 
-    # Here we are doing Feature Engineering, Example: rainfall * soil absorption, slope * distance_from_river etc, to get more details
-    if "rainfall" in X.columns and "soil_absorption" in X.columns:
-        X["rainfall_absorption"] = X["rainfall"] * X["soil_absorption"]
+    # Feature engineering happens once in preprocess_data (see feature_engineering.py)
 
-    if "slope" in X.columns and "river_distance" in X.columns:
-        X["slope_river_interaction"] = X["slope"] * X["river_distance"]
-
-    
-    # Using SMOTE (Synthetic Minority Over-sampling Technique) for balancing classes by generating samples for the minority class, Helps in Creating Model Biases
-    smote = SMOTE(random_state=42)
-    X_resampled, y_resampled = smote.fit_resample(X, y)
+    # Balancing the classes, SMOTE (Synthetic Minority Over-sampling Technique) by default, see rebalance.py.
+    # The forest already uses class_weight="balanced", which is all the "weights" mode needs
+    with stage("rebalance"):
+        X_resampled, y_resampled, _ = rebalance(X, y, rebalance_mode)
 
     #  Preprocesing(SS normalize input for algo, onehot converts categories to numeric vector)
     preprocessor = ColumnTransformer(
@@ -39,42 +70,59 @@ def train_random_forest(X, y):
         ]
     )
 
-    # a pipeline that sequentally preprocesses inputs and trains a balanced Random Forest classifier with 200 trees.
-    model = Pipeline(steps=[
-        ('preprocessor', preprocessor),
-        ('rf', RandomForestClassifier(
+    if mode == "baseline":
+        classifier, model_name = RandomForestClassifier(
             n_estimators=200,
             max_depth=None,
             class_weight="balanced",  
+            random_state=42,
+            n_jobs=n_jobs
+        ), "Random Forest"
+    elif mode == "fast":
+        # Bounded trees built on every core, much smaller pickle and faster per-row inference
+        classifier, model_name = RandomForestClassifier(
+            n_estimators=200,
+            max_depth=max_depth,
+            max_leaf_nodes=max_leaf_nodes,
+            min_samples_leaf=2,
+            class_weight="balanced",
+            random_state=42,
+            n_jobs=n_jobs or -1
+        ), "Random Forest (Fast)"
+    else:
+        # Histogram-based boosting bins features once, training is multi-threaded via OpenMP
+        classifier, model_name = HistGradientBoostingClassifier(
+            max_depth=max_depth,
+            max_leaf_nodes=max_leaf_nodes or 31,
+            class_weight="balanced",
             random_state=42
-        ))
+        ), "Hist Gradient Boosting"
+
+    # a pipeline that sequentally preprocesses inputs and trains the selected classifier.
+    model = Pipeline(steps=[
+        ('preprocessor', preprocessor),
+        ('rf', classifier)
     ])
 
     # Training begins here
-    model.fit(X_resampled, y_resampled)
-
-    return model,"Random Forest"
-
+    with stage("fit"):
+        model.fit(X_resampled, y_resampled)
 
-def evaluate_model(model, X_test, y_test):
-    y_pred = model.predict(X_test)
-    acc = accuracy_score(y_test, y_pred)
-    report_text = classification_report(y_test, y_pred)
-    cm = confusion_matrix(y_test, y_pred)
+    if size_budget_mb is not None:
+        model = _fit_size_budget(model, size_budget_mb, X_resampled, y_resampled)
 
-    print("Accuracy: ", round(acc, 4))
-    print("Classification Report:", report_text)
-    print("Confusion Matrix:", cm)
+    # n_jobs is kept in the pickle, and a parallel forest starts a joblib pool on every predict_proba
+    # call, which dominates single-row latency in app.py / serve.py
+    if "n_jobs" in classifier.get_params():
+        model.set_params(rf__n_jobs=None)
 
-    # Also return the structured dict report for logging
-    report_dict = classification_report(y_test, y_pred, output_dict=True)
-    return acc, report_dict, cm
+    return model, model_name
 
 
-def save_model(model, scaler, label_encoders, model_file="flood_model.pkl"):
-    package = {"model": model, "scaler": scaler, "encoders": label_encoders}
+def save_model(model, scaler, label_encoders, model_file="flood_model.pkl", features=None):
+    package = {"model": model, "scaler": scaler, "encoders": label_encoders, "features": features}
     joblib.dump(package, model_file)
-    print(f"Model, scaler, and encoders saved to {model_file}")
+    print(f"Model, scaler, encoders and features saved to {model_file}")
 
 
 def load_model(model_file="flood_model.pkl"):
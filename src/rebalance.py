@@ -0,0 +1,134 @@
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+# Class rebalancing applied by the train_* functions before fitting:
+#   "smote"        imblearn SMOTE on the full training set (the original behaviour)
+#   "weights"      no resampling, classes are weighted instead (class_weight / scale_pos_weight)
+#   "undersample"  random undersampling of the larger classes down to the smallest one
+#   "smote_approx" SMOTE interpolation with approximate k-NN from a KD-tree (eps > 0), stored
+#                  under .cache/rebalance so parallel trainers and repeated runs on the same
+#                  split reuse the synthetic rows instead of recomputing them; the cache is kept
+#                  under MAX_CACHE_BYTES with preprocess_cache's LRU eviction
+REBALANCE_MODES = ("smote", "weights", "undersample", "smote_approx")
+CACHE_DIR = os.path.join(".cache", "rebalance")
+MAX_CACHE_BYTES = 1024 ** 3
+
+
+def balanced_class_weight(y):
+    # Same weights as class_weight="balanced": n_samples / (n_classes * count)
+    classes, counts = np.unique(y, return_counts=True)
+    return {c.item(): len(y) / (len(classes) * n) for c, n in zip(classes, counts)}
+
+
+def scale_pos_weight(class_weight):
+    # XGBoost's binary equivalent: weight of the positive class relative to the negative one
+    return class_weight[1] / class_weight[0]
+
+
+def _take(X, idx):
+    return X.iloc[idx].reset_index(drop=True) if hasattr(X, "iloc") else np.asarray(X)[idx]
+
+
+def _with_rows(X, new_rows):
+    if hasattr(X, "iloc"):
+        import pandas as pd
+        return pd.concat([X.reset_index(drop=True), pd.DataFrame(new_rows, columns=X.columns)], ignore_index=True)
+    return np.vstack([np.asarray(X), new_rows])
+
+
+def random_undersample(X, y, random_state=42):
+    rng = np.random.default_rng(random_state)
+    y = np.asarray(y)
+    classes, counts = np.unique(y, return_counts=True)
+    keep = np.concatenate([rng.choice(np.flatnonzero(y == c), counts.min(), replace=False) for c in classes])
+    keep.sort()
+    return _take(X, keep), y[keep]
+
+
+def approx_smote(X, y, k_neighbors=5, eps=0.5, random_state=42):
+    # Synthetic rows x + u * (neighbour - x) for every class smaller than the largest one. The
+    # neighbours come from cKDTree.query with eps, which may return points up to (1 + eps) times
+    # farther than the true k-th neighbour and is much cheaper than an exact search.
+    from scipy.spatial import cKDTree
+
+    rng = np.random.default_rng(random_state)
+    values = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    classes, counts = np.unique(y, return_counts=True)
+    new_X, new_y = [], []
+    for c, n in zip(classes, counts):
+        n_new = counts.max() - n
+        if n_new == 0:
+            continue
+        members = values[y == c]
+        k = min(k_neighbors, len(members) - 1)
+        if k < 1:
+            new_X.append(members[rng.integers(0, len(members), n_new)])
+            new_y.append(np.full(n_new, c))
+            continue
+        # First neighbour is the point itself
+        _, nn = cKDTree(members).query(members, k=k + 1, eps=eps, workers=-1)
+        base = rng.integers(0, len(members), n_new)
+        neighbour = nn[base, rng.integers(1, k + 1, n_new)]
+        gap = rng.random((n_new, 1))
+        new_X.append(members[base] + gap * (members[neighbour] - members[base]))
+        new_y.append(np.full(n_new, c))
+    if not new_X:
+        return X, y
+    return _with_rows(X, np.vstack(new_X)), np.concatenate([y] + new_y)
+
+
+def _cache_key(X, y, params):
+    h = hashlib.sha256(repr(sorted(params.items())).encode())
+    for arr in (np.ascontiguousarray(X, dtype=np.float64), np.ascontiguousarray(y)):
+        h.update(str(arr.shape).encode())
+        h.update(arr.data)
+    return h.hexdigest()[:16]
+
+
+def cached_approx_smote(X, y, k_neighbors=5, eps=0.5, random_state=42, cache_dir=CACHE_DIR,
+                        max_bytes=MAX_CACHE_BYTES):
+    # Only the synthetic rows are stored, the original rows are re-attached on load
+    from preprocess_cache import evict
+    key = _cache_key(X, y, {"k": k_neighbors, "eps": eps, "seed": random_state})
+    path = os.path.join(cache_dir, f"{key}.npz")
+    if os.path.exists(path):
+        with np.load(path) as cached:
+            new_X, new_y = cached["X"], cached["y"]
+        # Touching the entry so eviction treats it as recently used
+        os.utime(path)
+        print(f"Using cached SMOTE rows ({key})")
+        if len(new_X) == 0:
+            return X, np.asarray(y)
+        return _with_rows(X, new_X), np.concatenate([np.asarray(y), new_y])
+
+    X_res, y_res = approx_smote(X, y, k_neighbors, eps, random_state)
+    n = len(y)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Written to a temp file and renamed, trainers running in parallel may race on the same key
+    fd, tmp = tempfile.mkstemp(prefix=".tmp_", dir=cache_dir, suffix=".npz")
+    with os.fdopen(fd, "wb") as fh:
+        np.savez(fh, X=np.asarray(X_res, dtype=np.float64)[n:], y=np.asarray(y_res)[n:])
+    os.replace(tmp, path)
+    evict(cache_dir, max_bytes)
+    return X_res, y_res
+
+
+def rebalance(X, y, mode="smote", random_state=42):
+    # Returns (X, y, class_weight); class_weight is None unless the classifier should weight classes itself
+    if mode not in REBALANCE_MODES:
+        raise ValueError(f"Unknown rebalance mode '{mode}', expected one of {REBALANCE_MODES}")
+    if mode == "smote":
+        from imblearn.over_sampling import SMOTE
+        X_res, y_res = SMOTE(random_state=random_state).fit_resample(X, y)
+        return X_res, y_res, None
+    if mode == "weights":
+        return X, np.asarray(y), balanced_class_weight(np.asarray(y))
+    if mode == "undersample":
+        X_res, y_res = random_undersample(X, y, random_state)
+        return X_res, y_res, None
+    X_res, y_res = cached_approx_smote(X, y, random_state=random_state)
+    return X_res, y_res, None
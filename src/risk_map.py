@@ -0,0 +1,182 @@
+import argparse
+import datetime
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from preprocessing_script import load_data, transform_features
+from model_registry import get_bundle
+
+# Precomputed flood risk for every cell of a lat/long grid. Each refresh hashes the feature
+# vector of every cell and only rescores the cells whose hash changed since the last run,
+# so a weather refresh that touches a few regions costs a few predictions, not the whole map.
+RISK_DB = "risk_map.db"
+WEATHER_COLUMNS = ["Rainfall", "Temperature", "Humidity"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cells (
+    cell_id TEXT PRIMARY KEY,
+    latitude REAL,
+    longitude REAL,
+    feature_hash INTEGER,
+    probability REAL,
+    prediction INTEGER,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cells_lat_lon ON cells(latitude, longitude);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def cell_ids(lat, lon, resolution):
+    lat_idx = np.floor(np.asarray(lat, dtype=float) / resolution).astype(np.int64)
+    lon_idx = np.floor(np.asarray(lon, dtype=float) / resolution).astype(np.int64)
+    return pd.Series(lat_idx).astype(str).str.cat(pd.Series(lon_idx).astype(str), sep="_").to_numpy()
+
+
+def build_grid(static_path, resolution=0.25, target_col="Flood Occurred"):
+    # One representative row of static features per grid cell
+    df = load_data(static_path).dropna().drop(columns=[target_col], errors="ignore")
+    df = df.assign(**{"Cell ID": cell_ids(df["Latitude"], df["Longitude"], resolution)})
+    grid = df.drop_duplicates("Cell ID").set_index("Cell ID")
+    print(f"Built grid with {len(grid)} cells at {resolution} degree resolution")
+    return grid
+
+
+def apply_weather(grid, snapshot, max_distance=1.0):
+    # Overwrites the weather columns of each cell with its nearest snapshot location within max_distance degrees
+    from scipy.spatial import cKDTree
+
+    snapshot = snapshot[snapshot["Status"] == "ok"].dropna(subset=["Latitude", "Longitude"])
+    if snapshot.empty:
+        return grid
+    tree = cKDTree(snapshot[["Latitude", "Longitude"]].to_numpy(dtype=float))
+    dist, idx = tree.query(grid[["Latitude", "Longitude"]].to_numpy(dtype=float), distance_upper_bound=max_distance)
+    covered = np.isfinite(dist)
+
+    grid = grid.copy()
+    for col in WEATHER_COLUMNS:
+        values = snapshot[col].to_numpy(dtype=float)
+        grid.loc[covered, col] = values[idx[covered]]
+    return grid
+
+
+def feature_hashes(grid):
+    # Stable 64-bit hash of each cell's feature vector, stored as signed int for SQLite
+    return pd.util.hash_pandas_object(grid, index=False).to_numpy().view(np.int64)
+
+
+def rescore(grid, model_file, db_path=RISK_DB, batch_size=100_000, force=False):
+    bundle = get_bundle(model_file)
+    model_key = f"{os.path.abspath(model_file)}:{os.stat(model_file).st_mtime_ns}"
+    hashes = pd.Series(feature_hashes(grid), index=grid.index)
+
+    conn = _connect(db_path)
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'model'").fetchone()
+        # A different model makes every stored probability stale
+        if force or row is None or row[0] != model_key:
+            dirty = np.ones(len(grid), dtype=bool)
+        else:
+            stored = pd.read_sql_query("SELECT cell_id, feature_hash FROM cells", conn, index_col="cell_id")
+            previous = stored["feature_hash"].astype("Int64").reindex(grid.index)
+            dirty = (previous != hashes).fillna(True).to_numpy(dtype=bool)
+
+        dirty_cells = grid[dirty]
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for start in range(0, len(dirty_cells), batch_size):
+            batch = dirty_cells.iloc[start:start + batch_size]
+            X = transform_features(batch, bundle["scaler"], bundle["encoders"], features=bundle.get("features"))
+            proba = bundle["model"].predict_proba(X)[:, 1]
+            conn.executemany(
+                "INSERT OR REPLACE INTO cells VALUES (?, ?, ?, ?, ?, ?, ?)",
+                zip(batch.index.tolist(), batch["Latitude"].astype(float).tolist(),
+                    batch["Longitude"].astype(float).tolist(), hashes[batch.index].tolist(),
+                    proba.astype(float).tolist(), (proba >= 0.5).astype(int).tolist(),
+                    [timestamp] * len(batch))
+            )
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('model', ?)", (model_key,))
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('updated_at', ?)", (timestamp,))
+        conn.commit()
+    finally:
+        conn.close()
+
+    print(f"Rescored {int(dirty.sum())} of {len(grid)} cells ({len(grid) - int(dirty.sum())} unchanged)")
+    return int(dirty.sum())
+
+
+def lookup_risk(lat, lon, db_path=RISK_DB, radius=0.5):
+    # Nearest precomputed cell within radius degrees, or None if there's no map yet
+    if lat is None or lon is None or not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(db_path, timeout=5)
+    try:
+        row = conn.execute(
+            "SELECT cell_id, probability, prediction, updated_at, "
+            "(latitude - ?) * (latitude - ?) + (longitude - ?) * (longitude - ?) AS d2 FROM cells "
+            "WHERE latitude BETWEEN ? AND ? AND longitude BETWEEN ? AND ? ORDER BY d2 LIMIT 1",
+            (lat, lat, lon, lon, lat - radius, lat + radius, lon - radius, lon + radius)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    return {"cell_id": row[0], "probability": row[1], "prediction": row[2], "updated_at": row[3]}
+
+
+def refresh(grid, model_file, db_path=RISK_DB, snapshot_path=None, locations=None):
+    if snapshot_path:
+        snapshot = load_data(snapshot_path)
+    else:
+        from weather_bulk import fetch_snapshot
+        snapshot = fetch_snapshot(locations)
+    return rescore(apply_weather(grid, snapshot), model_file, db_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the flood risk map and keep it fresh.")
+    parser.add_argument("--model", default=None, help="Bundle path (default: current model in the artifact store)")
+    parser.add_argument("--static", default="data/flood_risk_dataset_india.csv",
+                        help="Dataset-shaped file providing static features per location")
+    parser.add_argument("--resolution", type=float, default=0.25, help="Grid cell size in degrees")
+    parser.add_argument("--db", default=RISK_DB)
+    parser.add_argument("--snapshot", default=None, help="Use this weather snapshot instead of fetching live")
+    parser.add_argument("--locations", default=None, help="Locations file for live weather fetches")
+    parser.add_argument("--every", type=float, default=0, help="Refresh interval in seconds (0 = run once)")
+    args = parser.parse_args()
+
+    if args.model is None:
+        from artifact_store import resolve
+        args.model = resolve()
+    grid = build_grid(args.static, args.resolution)
+    locations = None
+    if args.locations:
+        from weather_bulk import read_locations
+        locations = read_locations(args.locations)
+
+    while True:
+        start = time.perf_counter()
+        try:
+            refresh(grid, args.model, args.db, args.snapshot, locations)
+        except Exception as e:
+            print(f"Refresh failed: {e}")
+        print(f"Refresh took {time.perf_counter() - start:.2f}s")
+        if not args.every:
+            break
+        time.sleep(max(0.0, args.every - (time.perf_counter() - start)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import argparse
+import asyncio
+import bisect
+import time
+from contextlib import asynccontextmanager
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Request
+
+from preprocessing_script import transform_features
+from model_registry import get_bundle
+
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += 1
+        self.sum += value
+
+    def to_dict(self):
+        labels = [f"le_{b}" for b in self.buckets] + ["le_inf"]
+        return {
+            "count": self.total,
+            "mean": self.sum / self.total if self.total else 0.0,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class MicroBatcher:
+    # Collects rows from concurrent requests and scores them with one predict_proba call
+    def __init__(self, model_file, max_batch_size=256, max_wait_ms=5.0):
+        self.model_file = model_file
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue()
+        self.batch_sizes = Histogram(buckets=[1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024])
+        self._worker = None
+
+    def start(self):
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+
+    async def submit(self, df):
+        # Encoding and scaling happen per request, so a bad frame (missing column, wrong type) fails
+        # only its own request instead of the whole batch it would have been scored in
+        loop = asyncio.get_running_loop()
+        X = await loop.run_in_executor(None, self._transform, df)
+        future = loop.create_future()
+        await self.queue.put((X, future))
+        return await future
+
+    def _transform(self, df):
+        bundle = get_bundle(self.model_file)
+        return transform_features(df, bundle["scaler"], bundle["encoders"], features=bundle.get("features"))
+
+    def _score(self, X):
+        return get_bundle(self.model_file)["model"].predict_proba(X)[:, 1]
+
+    def _score_each(self, items):
+        # Fallback after a failed batch: score requests one by one so only the failing ones get the error
+        results = []
+        for X, _ in items:
+            try:
+                results.append(self._score(X))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            n_rows = len(items[0][0])
+            deadline = loop.time() + self.max_wait
+
+            # Keep pulling requests until the batch is full or the wait window closes
+            while n_rows < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                n_rows += len(item[0])
+
+            self.batch_sizes.observe(n_rows)
+            try:
+                batch = np.vstack([X for X, _ in items]) if len(items) > 1 else items[0][0]
+                # Model runs in a worker thread so the event loop keeps accepting requests
+                proba = await loop.run_in_executor(None, self._score, batch)
+                offset, results = 0, []
+                for X, _ in items:
+                    results.append(proba[offset:offset + len(X)])
+                    offset += len(X)
+            except Exception:
+                results = await loop.run_in_executor(None, self._score_each, items)
+
+            for (_, future), result in zip(items, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+def create_app(model_file=None, max_batch_size=256, max_wait_ms=5.0):
+    if model_file is None:
+        # Pinned at startup, promoting another version takes effect on restart
+        from artifact_store import resolve
+        model_file = resolve()
+    batcher = MicroBatcher(model_file, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    latency = Histogram()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        get_bundle(model_file)
+        batcher.start()
+        yield
+        await batcher.stop()
+
+    app = FastAPI(title="Flood Prediction Scoring Service", lifespan=lifespan)
+
+    @app.post("/predict")
+    async def predict(request: Request):
+        start = time.perf_counter()
+        payload = await request.json()
+
+        # Accepts a single row object, a list of rows, or {"rows": [...]}
+        if isinstance(payload, dict) and "rows" in payload:
+            rows = payload["rows"]
+        elif isinstance(payload, dict):
+            rows = [payload]
+        else:
+            rows = payload
+        if not rows:
+            raise HTTPException(status_code=400, detail="No rows to score")
+
+        try:
+            proba = await batcher.submit(pd.DataFrame(rows))
+        except (KeyError, ValueError, TypeError) as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+        latency.observe((time.perf_counter() - start) * 1000)
+        return {
+            "probabilities": [float(p) for p in proba],
+            "predictions": [int(p) for p in (np.asarray(proba) >= 0.5)],
+        }
+
+    @app.get("/metrics")
+    async def metrics():
+        return {
+            "latency_ms": latency.to_dict(),
+            "batch_size": batcher.batch_sizes.to_dict(),
+            "max_batch_size": batcher.max_batch_size,
+            "max_wait_ms": batcher.max_wait * 1000,
+        }
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP scoring service with micro-batching.")
+    parser.add_argument("--model", default=None, help="Bundle path (default: current model in the artifact store)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    import uvicorn
+    app = create_app(args.model, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from preprocessing_script import load_data
+
+# Nearest-location lookup of the static (non-weather) features in the dataset. Points are stored
+# as 3-D unit vectors in a KD-tree, so Euclidean nearest neighbours are great-circle nearest
+# neighbours and there is no distortion near the poles or the antimeridian.
+STATIC_COLUMNS = ["Elevation", "Land Cover", "Soil Type", "Population Density", "Infrastructure", "Historical Floods"]
+INDEX_FILE = "spatial_index.joblib"
+EARTH_RADIUS_KM = 6371.0
+
+
+def _to_xyz(lat, lon):
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1))
+
+
+class SpatialIndex:
+    def __init__(self, tree, coords, columns):
+        self.tree = tree
+        self.coords = coords      # (n, 2) latitude / longitude of the indexed points
+        self.columns = columns    # column name -> numpy array, categoricals as pandas Categorical
+
+    @classmethod
+    def build(cls, df, static_columns=STATIC_COLUMNS):
+        from scipy.spatial import cKDTree
+
+        df = df.dropna(subset=["Latitude", "Longitude"] + list(static_columns))
+        # Several rows at the same point: the first one wins
+        df = df.drop_duplicates(["Latitude", "Longitude"])
+        coords = df[["Latitude", "Longitude"]].to_numpy(dtype=np.float64)
+        columns = {}
+        for col in static_columns:
+            values = df[col]
+            if values.dtype == object or str(values.dtype) == "category":
+                columns[col] = pd.Categorical(values)
+            else:
+                columns[col] = values.to_numpy()
+        return cls(cKDTree(_to_xyz(coords[:, 0], coords[:, 1])), coords, columns)
+
+    def save(self, path=INDEX_FILE):
+        joblib.dump(self, path)
+        print(f"Spatial index with {len(self.coords)} points saved to {path}")
+
+    @classmethod
+    def load(cls, path=INDEX_FILE):
+        return joblib.load(path)
+
+    def query(self, lat, lon):
+        chord, i = self.tree.query(_to_xyz([lat], [lon])[0])
+        row = {col: (values[i].item() if hasattr(values[i], "item") else values[i]) for col, values in self.columns.items()}
+        row["Matched Latitude"], row["Matched Longitude"] = self.coords[i]
+        row["Distance (km)"] = float(_chord_to_km(chord))
+        return row
+
+    def query_bulk(self, lat, lon, chunk_size=1_000_000, workers=-1):
+        # Vectorized lookup for many points, chunked to keep the xyz temporaries small
+        lat, lon = np.asarray(lat), np.asarray(lon)
+        idx = np.empty(len(lat), dtype=np.int64)
+        dist = np.empty(len(lat), dtype=np.float64)
+        for start in range(0, len(lat), chunk_size):
+            end = start + chunk_size
+            d, i = self.tree.query(_to_xyz(lat[start:end], lon[start:end]), workers=workers)
+            idx[start:end], dist[start:end] = i, d
+        out = {col: values[idx] for col, values in self.columns.items()}
+        out["Distance (km)"] = _chord_to_km(dist)
+        return pd.DataFrame(out)
+
+    def query_city(self, city):
+        from weather_api import get_weather_data
+        info = get_weather_data(city)
+        if info.get("lat") is None:
+            raise ValueError(f"No coordinates for {city}: {info.get('error', 'missing lat/lon')}")
+        return self.query(info["lat"], info["lon"])
+
+
+_loaded = {}
+
+
+def get_index(path=INDEX_FILE):
+    # Loaded once per process and reloaded if the file changes, like model_registry
+    if not os.path.exists(path):
+        return None
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    if key not in _loaded:
+        _loaded.clear()
+        _loaded[key] = SpatialIndex.load(path)
+    return _loaded[key]
+
+
+def benchmark(index, n_single=10_000, n_bulk=1_000_000):
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(8, 37, n_bulk)
+    lon = rng.uniform(68, 97, n_bulk)
+
+    start = time.perf_counter()
+    for i in range(n_single):
+        index.query(lat[i], lon[i])
+    single = (time.perf_counter() - start) / n_single
+
+    start = time.perf_counter()
+    index.query_bulk(lat, lon)
+    bulk = time.perf_counter() - start
+    print(f"Single query: {single * 1e6:.1f} us | bulk: {n_bulk} points in {bulk:.2f}s ({n_bulk / bulk:,.0f} points/sec)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the static-feature spatial index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    b = sub.add_parser("build")
+    b.add_argument("--data", default="data/flood_risk_dataset_india.csv")
+    b.add_argument("--output", default=INDEX_FILE)
+    q = sub.add_parser("query")
+    q.add_argument("--index", default=INDEX_FILE)
+    q.add_argument("--lat", type=float)
+    q.add_argument("--lon", type=float)
+    q.add_argument("--city", default=None)
+    bench = sub.add_parser("bench")
+    bench.add_argument("--index", default=INDEX_FILE)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        SpatialIndex.build(load_data(args.data)).save(args.output)
+        print(f"Built in {time.perf_counter() - start:.2f}s")
+    elif args.command == "query":
+        index = SpatialIndex.load(args.index)
+        print(index.query_city(args.city) if args.city else index.query(args.lat, args.lon))
+    else:
+        benchmark(SpatialIndex.load(args.index))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,37 @@
 from sklearn.svm import SVC
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.kernel_approximation import Nystroem, RBFSampler
+from sklearn.linear_model import SGDClassifier
+from sklearn.calibration import CalibratedClassifierCV
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
-from imblearn.over_sampling import SMOTE
+from instrumentation import stage
+from evaluation import evaluate_model  # shared implementation, re-exported for main.py
+from rebalance import rebalance
 
-def train_svm(X, y):
+# mode -> kernel approximation used instead of the exact RBF SVC
+KERNEL_APPROXIMATIONS = {"nystroem": Nystroem, "rff": RBFSampler}
+
+
+def train_svm(X, y, n_jobs=None, mode="exact", n_components=500, rebalance_mode="smote"):
+    # mode="exact" is the libsvm RBF SVC (single-threaded, n_jobs only used by the approximate modes).
+    # "nystroem" / "rff" approximate the RBF kernel with n_components features and fit a linear SVM
+    # with SGD, so fit time is linear in rows and prediction no longer depends on support vectors.
+    if mode != "exact" and mode not in KERNEL_APPROXIMATIONS:
+        raise ValueError(f"Unknown SVM mode '{mode}', expected 'exact' or one of {sorted(KERNEL_APPROXIMATIONS)}")
     if isinstance(X, np.ndarray):
         X = pd.DataFrame(X)
 
     categorical_cols = X.select_dtypes(include=['object', 'category']).columns
     numeric_cols = X.select_dtypes(include=['int64', 'float64']).columns
 
-    # Feature Engineering (optional but helps improve performance)
-    if "rainfall" in X.columns and "elevation" in X.columns:
-        X["rainfall_elevation_interaction"] = X["rainfall"] * X["elevation"]
-
-    if "humidity" in X.columns and "temperature" in X.columns:
-        X["humid_temp_interaction"] = X["humidity"] * X["temperature"]
+    # Feature engineering happens once in preprocess_data (see feature_engineering.py)
 
-    # Handling class imbalance using SMOTE
-    smote = SMOTE(random_state=42)
-    X_resampled, y_resampled = smote.fit_resample(X, y)
+    # Handling class imbalance, SMOTE by default (see rebalance.py)
+    with stage("rebalance"):
+        X_resampled, y_resampled, class_weight = rebalance(X, y, rebalance_mode)
 
     # Preprocessing pipeline
     preprocessor = ColumnTransformer(
@@ -33,24 +41,28 @@ def train_svm(X, y):
         ]
     )
 
-    # Full training pipeline
+    if mode == "exact":
+        # Full training pipeline
+        model = Pipeline(steps=[
+            ('preprocessor', preprocessor),
+            ('svm', SVC(kernel='rbf', C=1.0, probability=True, class_weight=class_weight, random_state=42))
+        ])
+        with stage("fit"):
+            model.fit(X_resampled, y_resampled)
+        return model, "Support Vector Machine"
+
+    # Same gamma as SVC(gamma='scale') on standardized inputs: 1 / n_features
+    n_features = len(numeric_cols) + sum(X_resampled[c].nunique() for c in categorical_cols)
+    approx = KERNEL_APPROXIMATIONS[mode](gamma=1.0 / max(1, n_features), n_components=n_components, random_state=42)
+
+    # Hinge-loss SGD is a linear SVM, probabilities come from a separate sigmoid (Platt) calibration
+    linear_svm = SGDClassifier(loss='hinge', alpha=1e-4, max_iter=50, tol=1e-3, class_weight=class_weight,
+                               random_state=42)
     model = Pipeline(steps=[
         ('preprocessor', preprocessor),
-        ('svm', SVC(kernel='rbf', C=1.0, probability=True, random_state=42))
+        ('approx', approx),
+        ('svm', CalibratedClassifierCV(linear_svm, method='sigmoid', cv=3, n_jobs=n_jobs))
     ])
-
-    model.fit(X_resampled, y_resampled)
-    return model, "Support Vector Machine"
-
-def evaluate_model(model, X_test, y_test):
-    y_pred = model.predict(X_test)
-    acc = accuracy_score(y_test, y_pred)
-    report_text = classification_report(y_test, y_pred)
-    cm = confusion_matrix(y_test, y_pred)
-
-    print("Accuracy: ", round(acc, 4))
-    print("Classification Report:", report_text)
-    print("Confusion Matrix:", cm)
-
-    report_dict = classification_report(y_test, y_pred, output_dict=True)
-    return acc, report_dict, cm
+    with stage("fit"):
+        model.fit(X_resampled, y_resampled)
+    return model, f"Support Vector Machine ({'Nystroem' if mode == 'nystroem' else 'RFF'})"
@@ -1,15 +1,63 @@
+import os
+import threading
+import time
+
 import requests
-import streamlit as st
+from requests.adapters import HTTPAdapter
+
+# WEATHER_API_URL lets a local stub (weather_stub.py) stand in for weatherapi.com
+BASE_URL = os.environ.get("WEATHER_API_URL", "http://api.weatherapi.com/v1")
+CACHE_TTL = float(os.environ.get("WEATHER_CACHE_TTL", 600))
+TIMEOUT = (3.05, 10)  # (connect, read) seconds
+
+# Cities shown in the app and refreshed by weather_bulk.py
+MONITORED_CITIES = [
+    "Mumbai", "Delhi", "Kolkata", "Chennai", "Bengaluru", 
+    "Hyderabad", "Pune", "Ahmedabad", "Jaipur", "Lucknow",
+    "Patna", "Bhopal", "Guwahati", "Thiruvananthapuram", "Kochi",
+    "Varanasi", "Nagpur", "Surat", "Ranchi", "Chandigarh"
+]
+
+_lock = threading.Lock()
+_session = None
+_cache = {}     # city -> (expires_at, weather_info)
+_inflight = {}  # city -> _Flight shared by concurrent callers
+_metrics = {"hits": 0, "misses": 0, "upstream_calls": 0, "deduplicated": 0, "errors": 0}
+
 
-def get_weather_data(city: str):
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _get_session():
+    # One pooled session per process, connections are kept alive between calls
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=64)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def _api_key():
+    key = os.environ.get("WEATHER_API_KEY")
+    if key:
+        return key
     # Get API key from secrets.toml
-    api_key = st.secrets["weatherapi"]["api_key"]
+    import streamlit as st
+    return st.secrets["weatherapi"]["api_key"]
 
-    # API URL
-    url = f"http://api.weatherapi.com/v1/current.json?key={api_key}&q={city}&aqi=no"
 
+def _fetch(city, api_key):
     # Make request
-    response = requests.get(url)
+    response = _get_session().get(
+        f"{BASE_URL}/current.json", params={"key": api_key, "q": city, "aqi": "no"}, timeout=TIMEOUT
+    )
 
     if response.status_code == 200:
         data = response.json()
@@ -17,6 +65,8 @@ def get_weather_data(city: str):
             "city": data["location"]["name"],
             "region": data["location"]["region"],
             "country": data["location"]["country"],
+            "lat": data["location"].get("lat"),
+            "lon": data["location"].get("lon"),
             "temp_c": data["current"]["temp_c"],
             "humidity": data["current"]["humidity"],
             "condition": data["current"]["condition"]["text"],
@@ -25,3 +75,62 @@ def get_weather_data(city: str):
         return weather_info
     else:
         return {"error": "Unable to fetch weather data"}
+
+
+def get_weather_data(city: str, api_key: str = None, ttl: float = None):
+    key = city.strip().lower()
+    ttl = CACHE_TTL if ttl is None else ttl
+
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            _metrics["hits"] += 1
+            return dict(entry[1])
+        _metrics["misses"] += 1
+
+        # Single flight: concurrent misses for the same city wait on one upstream call
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Flight()
+        else:
+            _metrics["deduplicated"] += 1
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return dict(flight.result)
+
+    try:
+        with _lock:
+            _metrics["upstream_calls"] += 1
+        flight.result = _fetch(city, api_key or _api_key())
+        # Errors aren't cached so the next click retries
+        if "error" not in flight.result:
+            with _lock:
+                _cache[key] = (time.monotonic() + ttl, flight.result)
+        else:
+            with _lock:
+                _metrics["errors"] += 1
+    except Exception as e:
+        flight.error = e
+        with _lock:
+            _metrics["errors"] += 1
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+        flight.done.set()
+    return dict(flight.result)
+
+
+def cache_metrics():
+    with _lock:
+        total = _metrics["hits"] + _metrics["misses"]
+        return {**_metrics, "cached_cities": len(_cache), "hit_rate": _metrics["hits"] / total if total else 0.0}
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,159 @@
+import argparse
+import asyncio
+import datetime
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import weather_api
+from weather_api import get_weather_data, MONITORED_CITIES
+
+# Column names match the dataset so predict.py / risk scoring can join on them directly
+SNAPSHOT_COLUMNS = [
+    "Location", "City", "Region", "Country", "Latitude", "Longitude",
+    "Temperature", "Humidity", "Rainfall", "Condition", "Fetched At", "Status"
+]
+
+
+class RateLimiter:
+    # Token bucket shared by all tasks: at most `rate` calls per second, bursts up to `burst`
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def _normalize(location, info, status):
+    info = info or {}
+    return {
+        "Location": location,
+        "City": info.get("city"),
+        "Region": info.get("region"),
+        "Country": info.get("country"),
+        "Latitude": info.get("lat"),
+        "Longitude": info.get("lon"),
+        "Temperature": info.get("temp_c"),
+        "Humidity": info.get("humidity"),
+        "Rainfall": info.get("rainfall"),
+        "Condition": info.get("condition"),
+        "Fetched At": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "Status": status,
+    }
+
+
+async def _fetch_one(location, loop, pool, semaphore, limiter, retries, backoff, api_key, ttl):
+    async with semaphore:
+        for attempt in range(retries + 1):
+            await limiter.acquire()
+            try:
+                info = await loop.run_in_executor(pool, get_weather_data, location, api_key, ttl)
+                if "error" not in info:
+                    return _normalize(location, info, "ok")
+                status = info["error"]
+            except Exception as e:
+                status = f"{type(e).__name__}: {e}"
+            if attempt < retries:
+                # Exponential backoff with jitter
+                await asyncio.sleep(backoff * 2 ** attempt * (0.5 + random.random()))
+        return _normalize(location, None, status)
+
+
+async def fetch_all(locations, concurrency=32, rate_per_sec=50.0, retries=3, backoff=0.5, api_key=None, ttl=None):
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate_per_sec)
+    # get_weather_data is blocking, each in-flight call gets its own worker thread
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        rows = await asyncio.gather(*(
+            _fetch_one(loc, loop, pool, semaphore, limiter, retries, backoff, api_key, ttl) for loc in locations
+        ))
+    return pd.DataFrame(rows, columns=SNAPSHOT_COLUMNS)
+
+
+def fetch_snapshot(locations=None, **kwargs):
+    return asyncio.run(fetch_all(locations or MONITORED_CITIES, **kwargs))
+
+
+def write_snapshot(df, output):
+    dirpart = os.path.dirname(output)
+    if dirpart:
+        os.makedirs(dirpart, exist_ok=True)
+    tmp = f"{output}.tmp"
+    if output.endswith(".parquet"):
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, output)
+    ok = int((df["Status"] == "ok").sum())
+    print(f"Wrote weather snapshot for {ok}/{len(df)} locations to {output}")
+
+
+def read_locations(path):
+    with open(path) as fh:
+        return [line.strip() for line in fh if line.strip() and not line.startswith("#")]
+
+
+def benchmark(n_locations=200, latency_ms=50.0, concurrency=32):
+    # Sequential loop vs async fetcher against the local stub, cache disabled via ttl=0
+    from weather_stub import start_stub
+    server, url = start_stub(latency=latency_ms / 1000)
+    weather_api.BASE_URL = url
+    locations = [f"Location {i}" for i in range(n_locations)]
+    try:
+        start = time.perf_counter()
+        for loc in locations:
+            get_weather_data(loc, api_key="stub", ttl=0)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        df = fetch_snapshot(locations, concurrency=concurrency, rate_per_sec=10_000, api_key="stub", ttl=0)
+        concurrent = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    print(f"{n_locations} locations, {latency_ms:.0f} ms upstream latency")
+    print(f"  sequential: {sequential:6.2f}s ({n_locations / sequential:7.1f} locations/sec)")
+    print(f"  async x{concurrency:<3}: {concurrent:6.2f}s ({n_locations / concurrent:7.1f} locations/sec), "
+          f"{int((df['Status'] == 'ok').sum())} ok")
+    print(f"  speedup: {sequential / concurrent:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch current weather for many locations concurrently.")
+    parser.add_argument("--locations", default=None, help="File with one city or 'lat,lon' per line")
+    parser.add_argument("--output", default="data/weather_snapshot.csv")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rate", type=float, default=50.0, help="Max upstream requests per second")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--bench", action="store_true", help="Compare against the sequential loop on a local stub")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(concurrency=args.concurrency)
+        return
+
+    locations = read_locations(args.locations) if args.locations else MONITORED_CITIES
+    start = time.perf_counter()
+    df = fetch_snapshot(locations, concurrency=args.concurrency, rate_per_sec=args.rate, retries=args.retries)
+    print(f"Fetched {len(df)} locations in {time.perf_counter() - start:.2f}s")
+    write_snapshot(df, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Local stand-in for weatherapi.com's /v1/current.json, used by tests and benchmarks.
+# Point weather_api at it with WEATHER_API_URL=http://127.0.0.1:<port>/v1 and any WEATHER_API_KEY.
+
+
+def fake_weather(city):
+    # Deterministic per city so repeated runs are comparable
+    seed = int(hashlib.sha256(city.lower().encode()).hexdigest()[:8], 16)
+    return {
+        "location": {
+            "name": city.title(), "region": "Stub Region", "country": "India",
+            "lat": round(8 + (seed % 2800) / 100, 2), "lon": round(68 + (seed // 2800 % 2900) / 100, 2),
+        },
+        "current": {
+            "temp_c": round(15 + seed % 250 / 10, 1),
+            "humidity": 30 + seed % 70,
+            "precip_mm": round(seed % 500 / 10, 1),
+            "condition": {"text": ["Sunny", "Cloudy", "Light rain", "Heavy rain"][seed % 4]},
+        },
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    fail_every = 0
+    requests_served = 0
+    _count_lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        with self._count_lock:
+            type(self).requests_served += 1
+            count = type(self).requests_served
+        if self.latency:
+            time.sleep(self.latency)
+
+        city = parse_qs(url.query).get("q", [""])[0]
+        if url.path != "/v1/current.json" or not city:
+            self._send(400, {"error": {"message": "Parameter q is missing."}})
+        elif self.fail_every and count % self.fail_every == 0:
+            self._send(503, {"error": {"message": "Stub failure"}})
+        else:
+            self._send(200, fake_weather(city))
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub(port=0, latency=0.0, fail_every=0):
+    # Runs the stub in a daemon thread, returns (server, base_url)
+    handler = type("Handler", (StubHandler,), {"latency": latency, "fail_every": fail_every, "requests_served": 0})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local weatherapi.com stub.")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--fail-every", type=int, default=0, help="Return HTTP 503 on every Nth request")
+    args = parser.parse_args()
+
+    server, url = start_stub(args.port, args.latency_ms / 1000, args.fail_every)
+    print(f"Weather stub listening on {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,45 @@
+import time
 import xgboost as xgb
-from sklearn.model_selection import GridSearchCV
+from sklearn.base import clone
+from sklearn.model_selection import GridSearchCV, ParameterGrid, StratifiedKFold
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-from imblearn.over_sampling import SMOTE
+from sklearn.metrics import accuracy_score
+from instrumentation import stage
+from evaluation import evaluate_model  # shared implementation, re-exported for main.py
+from rebalance import rebalance, scale_pos_weight
 import pandas as pd
 import numpy as np
 
-def train_xgboost(X, y):
+# Hyperparameter grid shared by the grid and halving search modes
+PARAM_GRID = {
+    'classifier__n_estimators': [100, 200],
+    'classifier__max_depth': [4, 6, 8],
+    'classifier__learning_rate': [0.01, 0.05, 0.1],
+    'classifier__subsample': [0.8, 1.0],
+    'classifier__colsample_bytree': [0.8, 1.0],
+}
+
+def train_xgboost(X, y, n_jobs=None, search="grid", n_iter=30, rebalance_mode="smote"):
+    if search not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode '{search}', expected one of {sorted(SEARCH_MODES)}")
+
     if isinstance(X, np.ndarray):
         X = pd.DataFrame(X)
 
     categorical_cols = X.select_dtypes(include=['object', 'category']).columns
     numeric_cols = X.select_dtypes(include=['int64', 'float64']).columns
 
-    # Feature Engineering
-    if "Rainfall" in X.columns and "Humidity" in X.columns:
-        X["Rainfall_Humidity"] = X["Rainfall"] * X["Humidity"]
-    if "Temperature" in X.columns and "Elevation" in X.columns:
-        X["Temp_Elevation"] = X["Temperature"] * X["Elevation"]
-    if "River Discharge" in X.columns and "Water Level" in X.columns:
-        X["Discharge_Level"] = X["River Discharge"] * X["Water Level"]
-    if "Rainfall" in X.columns and "Elevation" in X.columns:
-        X["Rainfall_to_Elevation"] = X["Rainfall"] / (X["Elevation"] + 1)
-
-    # Balance classes
-    smote = SMOTE(random_state=42)
-    X_resampled, y_resampled = smote.fit_resample(X, y)
-
-    # Update numeric and categorical columns after feature engineering
+    # Feature engineering (Rainfall_Humidity, Discharge_Level, ...) happens once in preprocess_data
+
+    # Balance classes, SMOTE by default (see rebalance.py); "weights" becomes scale_pos_weight so
+    # every search fit trains on the original rows instead of the inflated resampled set
+    with stage("rebalance"):
+        X_resampled, y_resampled, class_weight = rebalance(X, y, rebalance_mode)
+    base_params = {'scale_pos_weight': scale_pos_weight(class_weight)} if class_weight else {}
+
+    # Update numeric and categorical columns after resampling
     categorical_cols = X_resampled.select_dtypes(include=['object', 'category']).columns
     numeric_cols = X_resampled.select_dtypes(include=['int64', 'float64']).columns
 
@@ -41,43 +51,163 @@ def train_xgboost(X, y):
         ]
     )
 
-    # Pipeline
+    with stage("fit"):
+        best_model, report = SEARCH_MODES[search](preprocessor, X_resampled, y_resampled, n_jobs, n_iter,
+                                                     base_params)
+    best_model.search_report_ = report
+
+    print("Best Parameters:", report["best_params"])
+    print(f"Search '{search}': {report['fits']} fits, {report['boosting_rounds']} boosting rounds, "
+          f"{report['seconds']:.1f}s, best CV accuracy {report['best_score']:.4f}")
+    return best_model, "XGBoost (Tuned)"
+
+
+def _make_classifier(n_threads=None, **params):
+    return xgb.XGBClassifier(
+        objective='binary:logistic',
+        eval_metric='logloss',
+        use_label_encoder=False,
+        random_state=42,
+        n_jobs=n_threads,
+        **params
+    )
+
+
+def _fold_matrices(preprocessor, X, y, cv=3):
+    # Fitting the scaler / one-hot encoder once per fold instead of once per candidate
+    folds = []
+    y = np.asarray(y)
+    for train_idx, val_idx in StratifiedKFold(n_splits=cv, shuffle=True, random_state=42).split(X, y):
+        pre = clone(preprocessor)
+        X_tr = pre.fit_transform(X.iloc[train_idx])
+        X_va = pre.transform(X.iloc[val_idx])
+        folds.append((X_tr, y[train_idx], X_va, y[val_idx]))
+    return folds
+
+
+def _final_model(preprocessor, params, X, y, n_jobs, base_params):
+    model = Pipeline(steps=[
+        ('preprocessor', clone(preprocessor)),
+        ('classifier', _make_classifier(n_threads=n_jobs, **base_params, **params))
+    ])
+    model.fit(X, y)
+    return model
+
+
+def _grid_search(preprocessor, X, y, n_jobs, n_iter, base_params):
+    start = time.perf_counter()
     pipeline = Pipeline(steps=[
         ('preprocessor', preprocessor),
-        ('classifier', xgb.XGBClassifier(
-            objective='binary:logistic',
-            eval_metric='logloss',
-            use_label_encoder=False,
-            random_state=42
-        ))
+        ('classifier', _make_classifier(n_threads=1 if n_jobs else None, **base_params))
     ])
+    grid_search = GridSearchCV(pipeline, PARAM_GRID, cv=3, scoring='accuracy', n_jobs=n_jobs or -1, verbose=2)
+    grid_search.fit(X, y)
 
-    # Hyperparameter tuning
-    param_grid = {
-        'classifier__n_estimators': [100, 200],
-        'classifier__max_depth': [4, 6, 8],
-        'classifier__learning_rate': [0.01, 0.05, 0.1],
-        'classifier__subsample': [0.8, 1.0],
-        'classifier__colsample_bytree': [0.8, 1.0],
+    candidates = list(ParameterGrid(PARAM_GRID))
+    best = {k.replace('classifier__', ''): v for k, v in grid_search.best_params_.items()}
+    return grid_search.best_estimator_, {
+        "mode": "grid",
+        "candidates": len(candidates),
+        "fits": len(candidates) * 3 + 1,
+        "boosting_rounds": sum(c['classifier__n_estimators'] for c in candidates) * 3 + best['n_estimators'],
+        "seconds": time.perf_counter() - start,
+        "best_score": float(grid_search.best_score_),
+        "best_params": best,
     }
 
-    grid_search = GridSearchCV(pipeline, param_grid, cv=3, scoring='accuracy', n_jobs=-1, verbose=2)
-    grid_search.fit(X_resampled, y_resampled)
 
-    best_model = grid_search.best_estimator_
+def _halving_search(preprocessor, X, y, n_jobs, n_iter, base_params, eta=3, min_rounds=25):
+    # Successive halving with boosting rounds as the resource, scored on cached fold matrices
+    start = time.perf_counter()
+    folds = _fold_matrices(preprocessor, X, y)
+    grid = {k.replace('classifier__', ''): v for k, v in PARAM_GRID.items() if k != 'classifier__n_estimators'}
+    max_rounds = max(PARAM_GRID['classifier__n_estimators'])
 
-    print("Best Parameters:", grid_search.best_params_)
-    return best_model, "XGBoost (Tuned)"
+    candidates = list(ParameterGrid(grid))
+    fits = rounds_used = 0
+    rounds = min_rounds
+    scores = []
+    while True:
+        scores = []
+        for params in candidates:
+            fold_scores = []
+            for X_tr, y_tr, X_va, y_va in folds:
+                clf = _make_classifier(n_threads=n_jobs, n_estimators=rounds, **base_params, **params)
+                clf.fit(X_tr, y_tr)
+                fold_scores.append(accuracy_score(y_va, clf.predict(X_va)))
+                fits += 1
+                rounds_used += rounds
+            scores.append(float(np.mean(fold_scores)))
+        if len(candidates) == 1 or rounds >= max_rounds:
+            break
+        order = np.argsort(scores)[::-1][:max(1, len(candidates) // eta)]
+        candidates = [candidates[i] for i in order]
+        rounds = min(rounds * eta, max_rounds)
+
+    best_idx = int(np.argmax(scores))
+    best = {**candidates[best_idx], 'n_estimators': rounds}
+    model = _final_model(preprocessor, best, X, y, n_jobs, base_params)
+    return model, {
+        "mode": "halving",
+        "candidates": len(ParameterGrid(grid)),
+        "fits": fits + 1,
+        "boosting_rounds": rounds_used + rounds,
+        "seconds": time.perf_counter() - start,
+        "best_score": scores[best_idx],
+        "best_params": best,
+    }
 
-def evaluate_model(model, X_test, y_test):
-    y_pred = model.predict(X_test)
-    acc = accuracy_score(y_test, y_pred)
-    report_text = classification_report(y_test, y_pred)
-    cm = confusion_matrix(y_test, y_pred)
 
-    print("Accuracy: ", round(acc, 4))
-    print("Classification Report:\n", report_text)
-    print("Confusion Matrix:\n", cm)
+def _bayes_search(preprocessor, X, y, n_jobs, n_iter, base_params, max_rounds=400, patience=20):
+    # TPE search where every fit stops early on XGBoost's eval set for that fold
+    try:
+        import optuna
+    except ImportError:
+        raise ImportError("search='bayes' needs optuna: pip install optuna")
+
+    start = time.perf_counter()
+    folds = _fold_matrices(preprocessor, X, y)
+    usage = {"fits": 0, "rounds": 0}
+
+    def objective(trial):
+        params = {
+            'max_depth': trial.suggest_int('max_depth', 3, 10),
+            'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
+            'subsample': trial.suggest_float('subsample', 0.6, 1.0),
+            'colsample_bytree': trial.suggest_float('colsample_bytree', 0.6, 1.0),
+            'min_child_weight': trial.suggest_float('min_child_weight', 1.0, 10.0, log=True),
+        }
+        fold_scores, best_rounds = [], []
+        for X_tr, y_tr, X_va, y_va in folds:
+            clf = _make_classifier(n_threads=n_jobs, n_estimators=max_rounds,
+                                   early_stopping_rounds=patience, **base_params, **params)
+            clf.fit(X_tr, y_tr, eval_set=[(X_va, y_va)], verbose=False)
+            fold_scores.append(accuracy_score(y_va, clf.predict(X_va)))
+            best_rounds.append(clf.best_iteration + 1)
+            usage["fits"] += 1
+            usage["rounds"] += clf.get_booster().num_boosted_rounds()
+        trial.set_user_attr('n_estimators', int(np.mean(best_rounds)))
+        return float(np.mean(fold_scores))
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.create_study(direction='maximize', sampler=optuna.samplers.TPESampler(seed=42))
+    study.optimize(objective, n_trials=n_iter)
+
+    best = {**study.best_params, 'n_estimators': study.best_trial.user_attrs['n_estimators']}
+    model = _final_model(preprocessor, best, X, y, n_jobs, base_params)
+    return model, {
+        "mode": "bayes",
+        "candidates": n_iter,
+        "fits": usage["fits"] + 1,
+        "boosting_rounds": usage["rounds"] + best['n_estimators'],
+        "seconds": time.perf_counter() - start,
+        "best_score": float(study.best_value),
+        "best_params": best,
+    }
+
 
-    report_dict = classification_report(y_test, y_pred, output_dict=True)
-    return acc, report_dict, cm
+SEARCH_MODES = {
+    "grid": _grid_search,
+    "halving": _halving_search,
+    "bayes": _bayes_search,
+}
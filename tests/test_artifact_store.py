@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+import artifact_store
+import model_registry
+
+
+def _data(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 4))
+    y = (X[:, 0] + 0.5 * X[:, 1] + rng.normal(scale=0.5, size=n) > 0.8).astype(int)
+    return X, y
+
+
+def _random_forest(X, y, mode):
+    from randomforest_model import train_random_forest
+    return train_random_forest(X, y, mode=mode, rebalance_mode="weights")[0]
+
+
+def _svm(X, y, mode):
+    from svm_model import train_svm
+    return train_svm(X, y, mode=mode, n_components=50, rebalance_mode="weights")[0]
+
+
+def _xgboost(X, y, _):
+    xgb = pytest.importorskip("xgboost")
+    return xgb.XGBClassifier(n_estimators=20, max_depth=3).fit(X, y)
+
+
+@pytest.mark.parametrize("train, mode", [
+    (_random_forest, "fast"),
+    (_random_forest, "hist"),
+    (_svm, "exact"),
+    (_svm, "nystroem"),
+    (_xgboost, None),
+])
+def test_predict_proba_through_store(tmp_path, monkeypatch, train, mode):
+    from sklearn.preprocessing import StandardScaler
+
+    monkeypatch.chdir(tmp_path)
+    model_registry.clear()
+    X, y = _data()
+    model = train(X, y, mode)
+    version_dir = artifact_store.publish(model, StandardScaler().fit(X), {}, f"{train.__name__} {mode}")
+    artifact_store.set_current(f"{train.__name__} {mode}")
+
+    assert artifact_store.verify(version_dir)
+    for bundle in (model_registry.get_bundle(), artifact_store.load()):
+        # Memory-mapped by default, the scaler arrays stay shared with the file
+        assert isinstance(bundle["scaler"].mean_, np.memmap)
+        proba = bundle["model"].predict_proba(X[:20])
+        assert proba.shape == (20, 2)
+        np.testing.assert_allclose(proba, model.predict_proba(X[:20]))
+
+
+def _publish_logistic(name, X, y, C):
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import StandardScaler
+    return artifact_store.publish(LogisticRegression(C=C).fit(X, y), StandardScaler().fit(X), {}, name)
+
+
+def test_promotion_replaces_the_cached_current_model(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    model_registry.clear()
+    X, y = _data()
+    _publish_logistic("Logistic", X, y, C=1.0)
+    first = model_registry.get_bundle()
+    _publish_logistic("Logistic", X, y, C=0.1)
+    artifact_store.set_current("Logistic")
+
+    second = model_registry.get_bundle()
+    assert second is not first
+    assert second["model"].C == 0.1
+    assert model_registry.stats()["cached"] == 1
+    assert model_registry.get_bundle() is second
+
+
+def test_mmap_mode_is_part_of_the_cache_key(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    model_registry.clear()
+    X, y = _data()
+    path = os.path.join(_publish_logistic("Logistic", X, y, C=1.0), artifact_store.BUNDLE_FILE)
+    mapped = model_registry.get_bundle(path)
+    loaded = model_registry.get_bundle(path, mmap_mode=None)
+    assert isinstance(mapped["scaler"].mean_, np.memmap)
+    assert not isinstance(loaded["scaler"].mean_, np.memmap)
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from convert_dataset import iter_npy_chunks, read_npy_dir, write_npy_dir
+
+
+def _frame(n=50):
+    rng = np.random.default_rng(0)
+    # Mixed dtypes interleaved, so the dtype blocks don't follow the column order
+    return pd.DataFrame({
+        "Latitude": rng.uniform(8, 36, n),
+        "Soil Type": pd.Categorical(rng.choice(["Clay", "Loam", "Sandy"], n)),
+        "Infrastructure": rng.integers(0, 2, n),
+        "Rainfall (mm)": rng.uniform(0, 300, n),
+        "Land Cover": pd.Categorical(rng.choice(["Forest", "Urban"], n)),
+        "Flood Occurred": rng.integers(0, 2, n),
+    })
+
+
+def test_round_trip_keeps_column_order(tmp_path):
+    df = _frame()
+    write_npy_dir(df, str(tmp_path))
+    loaded = read_npy_dir(str(tmp_path))
+    assert list(loaded.columns) == list(df.columns)
+    pd.testing.assert_frame_equal(loaded, df, check_categorical=False)
+
+
+def _memmap_base(values):
+    # The np.memmap a view was sliced from (pandas may hand back a plain ndarray view of it)
+    while values is not None and not isinstance(values, np.memmap):
+        values = getattr(values, "base", None)
+    return values
+
+
+def test_numeric_columns_share_memory_with_the_files(tmp_path):
+    df = _frame()
+    write_npy_dir(df, str(tmp_path))
+    loaded = read_npy_dir(str(tmp_path))
+    for col in ("Latitude", "Infrastructure", "Rainfall (mm)", "Flood Occurred"):
+        values = loaded[col].to_numpy()
+        mapped = _memmap_base(values)
+        assert mapped is not None, f"{col} was copied out of the memory map"
+        assert np.shares_memory(values, mapped)
+        assert os.path.dirname(os.path.abspath(mapped.filename)) == os.path.abspath(tmp_path)
+
+
+def test_chunks_are_views_of_the_memory_maps(tmp_path):
+    df = _frame(n=50)
+    write_npy_dir(df, str(tmp_path))
+    chunks = list(iter_npy_chunks(str(tmp_path), 20))
+    assert [len(c) for c in chunks] == [20, 20, 10]
+    assert _memmap_base(chunks[1]["Latitude"].to_numpy()) is not None
+    pd.testing.assert_frame_equal(pd.concat(chunks), df, check_categorical=False)
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+import weather_api
+from weather_stub import fake_weather, start_stub
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    def start(latency=0.0, fail_every=0):
+        server, url = start_stub(latency=latency, fail_every=fail_every)
+        servers.append(server)
+        monkeypatch.setattr(weather_api, "BASE_URL", url)
+        return server.RequestHandlerClass
+
+    servers = []
+    weather_api.clear_cache()
+    yield start
+    for server in servers:
+        server.shutdown()
+    weather_api.clear_cache()
+
+
+def _delta(before):
+    after = weather_api.cache_metrics()
+    return {k: after[k] - before[k] for k in ("hits", "misses", "upstream_calls", "deduplicated", "errors")}
+
+
+def test_fetches_from_stub(stub):
+    stub()
+    info = weather_api.get_weather_data("Mumbai", api_key="test")
+    expected = fake_weather("Mumbai")
+    assert info["city"] == "Mumbai"
+    assert info["temp_c"] == expected["current"]["temp_c"]
+    assert info["rainfall"] == expected["current"]["precip_mm"]
+
+
+def test_ttl_cache(stub):
+    handler = stub()
+    before = weather_api.cache_metrics()
+    first = weather_api.get_weather_data("Delhi", api_key="test", ttl=0.2)
+    assert weather_api.get_weather_data(" delhi ", api_key="test", ttl=0.2) == first
+    assert handler.requests_served == 1
+
+    time.sleep(0.3)
+    weather_api.get_weather_data("Delhi", api_key="test", ttl=0.2)
+    assert handler.requests_served == 2
+    assert _delta(before) == {"hits": 1, "misses": 2, "upstream_calls": 2, "deduplicated": 0, "errors": 0}
+    assert weather_api.cache_metrics()["cached_cities"] == 1
+
+
+def test_single_flight(stub):
+    handler = stub(latency=0.2)
+    before = weather_api.cache_metrics()
+    barrier = threading.Barrier(8)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(weather_api.get_weather_data("Pune", api_key="test"))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert handler.requests_served == 1
+    assert len(results) == 8 and all(r == results[0] for r in results)
+    delta = _delta(before)
+    assert delta["upstream_calls"] == 1
+    assert delta["misses"] == 8
+    assert delta["deduplicated"] == 7
+
+
+def test_errors_are_not_cached(stub):
+    handler = stub(fail_every=1)
+    before = weather_api.cache_metrics()
+    assert "error" in weather_api.get_weather_data("Kochi", api_key="test")
+    assert "error" in weather_api.get_weather_data("Kochi", api_key="test")
+    assert handler.requests_served == 2
+    assert _delta(before)["errors"] == 2
+    assert weather_api.cache_metrics()["cached_cities"] == 0